@@ -1,4 +1,5 @@
 import wave
+import threading
 import sounddevice as sd
 import numpy as np
 
@@ -22,22 +23,139 @@ def init_audio_device():
         return False
 
 
+WAV_WRITE_BUFFER = 1 << 17  # Bytes buffered before a recording is written to disk
+
+
+class BufferedWaveWriter(wave.Wave_write):
+    """WAV writer on a file with a large write buffer, the file is closed with it"""
+
+    def __init__(self, filename, buffer_size=WAV_WRITE_BUFFER):
+        self._buffered_file = open(filename, 'wb', buffering=buffer_size)
+        super().__init__(self._buffered_file)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._buffered_file.close()
+
+
 def start_audio_recording(filename, sample_rate=DEFAULT_SAMPLE_RATE):
     """Start recording audio to a WAV file"""
-    wav_file = wave.open(filename, 'wb')
+    wav_file = BufferedWaveWriter(filename)
     wav_file.setnchannels(2)  # stereo
     wav_file.setsampwidth(2)  # 2 bytes per sample
     wav_file.setframerate(sample_rate)
     return wav_file
 
 
+# Scratch buffers reused by write_audio_samples, grown to the largest chunk seen
+_F32_SCRATCH = np.empty(0, dtype=np.float32)
+_INT16_SCRATCH = np.empty(0, dtype=np.int16)
+
+
 def write_audio_samples(wav_file, samples):
     """Write audio samples to the WAV file"""
-    # Convert float samples to 16-bit integers
-    scaled = np.int16(samples * 32767)
-    wav_file.writeframes(scaled.tobytes())
+    global _F32_SCRATCH, _INT16_SCRATCH
+    n = samples.size
+    if len(_F32_SCRATCH) < n:
+        _F32_SCRATCH = np.empty(n, dtype=np.float32)
+        _INT16_SCRATCH = np.empty(n, dtype=np.int16)
+
+    # Convert float samples to 16-bit integers in the scratch buffers
+    scaled = _F32_SCRATCH[:n].reshape(samples.shape)
+    np.multiply(samples, 32767, out=scaled, casting='same_kind')
+    np.clip(scaled, -32768, 32767, out=scaled)
+    pcm = _INT16_SCRATCH[:n].reshape(samples.shape)
+    np.copyto(pcm, scaled, casting='unsafe')
+    # writeframesraw() leaves the header alone, writeframes() would seek back and
+    # patch it on every chunk and flush the write buffer each time. The header is
+    # written once when the file is closed.
+    wav_file.writeframesraw(pcm)
 
 
 def stop_audio_recording(wav_file):
     """Close the WAV file"""
     wav_file.close()
+
+
+class AudioRing:
+    """Fixed-size FIFO of stereo float32 frames backed by one preallocated array
+
+    The main loop appends and drains while the audio callback reads, the lock
+    keeps the indices consistent between the two threads.
+    """
+
+    def __init__(self, frames):
+        self.buf = np.zeros((frames, 2), dtype=np.float32)
+        self.scratch = np.empty_like(self.buf)  # Joins wrapped frames in drain()
+        self.read_idx = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def append(self, chunk):
+        """Queue audio frames, dropping the oldest ones when the ring is full"""
+        size = len(self.buf)
+        chunk = chunk.reshape(len(chunk), -1)[-size:]  # Mono chunks go to both channels
+        n = len(chunk)
+
+        with self.lock:
+            # Overwrite the oldest frames on overflow, like a deque with maxlen
+            overflow = self.count + n - size
+            if overflow > 0:
+                self.read_idx = (self.read_idx + overflow) % size
+                self.count -= overflow
+
+            start = (self.read_idx + self.count) % size
+            first = min(n, size - start)
+            self.buf[start:start + first] = chunk[:first]
+            self.buf[:n - first] = chunk[first:]
+            self.count += n
+
+    def segments(self):
+        """Return the queued frames as at most two views, oldest first"""
+        size = len(self.buf)
+        end = self.read_idx + self.count
+        if end <= size:
+            return [self.buf[self.read_idx:end]]
+        return [self.buf[self.read_idx:], self.buf[:end - size]]
+
+    def read_into(self, out):
+        """Dequeue len(out) frames into out without allocating
+
+        Returns False and leaves the ring untouched when fewer are queued.
+        """
+        frames = len(out)
+        size = len(self.buf)
+        with self.lock:
+            if self.count < frames:
+                return False
+            first = min(frames, size - self.read_idx)
+            out[:first] = self.buf[self.read_idx:self.read_idx + first]
+            out[first:] = self.buf[:frames - first]
+            self.read_idx = (self.read_idx + frames) % size
+            self.count -= frames
+        return True
+
+    def drain(self):
+        """Dequeue all frames as one contiguous array, valid until the next append"""
+        with self.lock:
+            segments = self.segments()
+            if len(segments) == 1:
+                data = segments[0]
+            else:
+                first = len(segments[0])
+                np.copyto(self.scratch[:first], segments[0])
+                np.copyto(self.scratch[first:self.count], segments[1])
+                data = self.scratch[:self.count]
+            self.read_idx = 0
+            self.count = 0
+        return data
+
+    def clear(self):
+        with self.lock:
+            self.read_idx = 0
+            self.count = 0
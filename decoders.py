@@ -100,16 +100,13 @@ def decode_afsk(samples, sample_rate):
     filtered_1200 = bandpass_filter(samples, 1100, 1300, sample_rate)
     filtered_2200 = bandpass_filter(samples, 2100, 2300, sample_rate)
 
-    # Calculate energy in each band
+    # Calculate energy in each band, one row per bit period
     window = int(sample_rate / 1200)  # One bit period
-    bits = []
+    num_bits = max(0, -(-(len(samples) - window) // window))
+    e1200 = np.square(filtered_1200[:num_bits * window]).reshape(num_bits, window).sum(axis=1)
+    e2200 = np.square(filtered_2200[:num_bits * window]).reshape(num_bits, window).sum(axis=1)
 
-    for i in range(0, len(samples) - window, window):
-        e1200 = np.sum(filtered_1200[i:i+window]**2)
-        e2200 = np.sum(filtered_2200[i:i+window]**2)
-        bits.append(1 if e2200 > e1200 else 0)
-
-    return bits
+    return (e2200 > e1200).astype(int).tolist()
 
 
 def decode_aprs(samples, sample_rate):
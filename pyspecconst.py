@@ -243,6 +243,10 @@ SIGNAL_TYPES = {
     }
 }
 
+# Signal types as stored in scan results, classify_signal also returns 'UNKNOWN'
+SIGNAL_TYPE_NAMES = tuple(SIGNAL_TYPES) + ('UNKNOWN',)
+SIGNAL_TYPE_IDS = {name: i for i, name in enumerate(SIGNAL_TYPE_NAMES)}
+
 BAND_PRESETS = {
     # Amateur Radio Bands
     'HAM160': (1.8e6, 2.0e6, "160m Amateur Band"),
@@ -315,6 +319,9 @@ BAND_PRESETS = {
     'WWVH': (2.5e6, 15.0e6, "WWVH Time Signals"),
 }
 
+# Band presets in menu order as (key, (start, end, description)), the menus number them from 1
+BAND_PRESET_ITEMS = tuple(BAND_PRESETS.items())
+
 BAND_BANDWIDTHS = {
     'AM': 10e3,
     'NFM': 200e3,
@@ -78,14 +78,14 @@ import numpy as np
 import curses
 # from rtlsdr import RtlSdr
 
-import sounddevice as sd
-from collections import deque
 import argparse
 import time
 import os
 import configparser
 import json
 import os.path
+import bisect
+from concurrent.futures import ThreadPoolExecutor
 
 # import struct
 import SoapySDR
@@ -101,9 +101,25 @@ import decoders
 import ui
 
 
-audio_buffer = deque(maxlen=128)  # Increased from 16 for better continuity, was 24
+AUDIO_RING_FRAMES = DEFAULT_SAMPLE_RATE * 4  # About 4 seconds of queued audio
+audio_buffer = AudioRing(AUDIO_RING_FRAMES)
 SAMPLES = 7
 INTENSITY_CHARS = ' .,:|\\'  # Simple ASCII characters for intensity levels
+SPECTRUM_TIER_LIMITS = [0.2, 0.4, 0.8]  # Normalized levels separating noise/weak/medium/strong bars
+SPECTRUM_BAR_CHARS = np.array([  # Per tier: (lower, upper) part of a bar, as ASCII codes
+    [b' ', b'.'],
+    [b'.', b'-'],
+    [b'-', b'='],
+    [b'=', b'#'],
+]).view(np.uint8)
+WATERFALL_CHARS = np.frombuffer(b'.-=#', dtype=np.uint8)  # Waterfall cell glyphs, weakest to strongest
+GRADIENT_CHARS = np.frombuffer(b' ._-=+*#@', dtype=np.uint8)  # Gradient waterfall glyphs, darkest to brightest
+SPECTRUM_BAR_PAIRS = [  # Per tier: color pairs of the (lower, upper) part of a bar
+    [10, 11],
+    [12, 12],
+    [13, 13],
+    [14, 14],
+]
 BOOKMARK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sdr_bookmarks.json")
 SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sdr_settings.ini")
 CURRENT_MODE = 'VFO'  # Default mode
@@ -126,9 +142,16 @@ SIGNAL_THRESHOLD = -40  # dB threshold for signal detection
 SCAN_STEP = 100e3      # 100 kHz steps by default
 MIN_SIGNAL_BANDWIDTH = 50e3  # Minimum bandwidth to consider as a signal
 SCAN_DWELL_TIME = 0.1  # Seconds to dwell on each frequency
+SCAN_SETTLE_SECS = 0.001  # Seconds to let the tuner settle after a retune
+SCAN_FLUSH_SAMPLES = 256  # Samples discarded after a retune (captured at the old frequency)
+SCAN_REFRESH_EVERY = 16  # Detected signals between forced screen updates while scanning
+SCAN_POLL_EVERY = 8  # Scan steps between checks for the cancel key
+SCAN_STATUS_INTERVAL = 0.1  # Seconds between scan progress redraws
+STATUS_MESSAGE_SECS = 1.5  # Seconds a status line message stays up
 SCAN_ACTIVE = False    # Global flag for scan state
-WATERFALL_HISTORY = []
 WATERFALL_MAX_LINES = 30  # Number of history lines to keep
+WATERFALL_HISTORY = SpectrumHistory(WATERFALL_MAX_LINES)
+RESAMPLE_CACHE = {}  # (num_bins, width) -> interpolation points used by resample_rows()
 WATERFALL_MODE = False    # Toggle between spectrum and waterfall
 WATERFALL_COLORS = [
     curses.COLOR_BLACK,   # Weakest signal
@@ -148,9 +171,9 @@ DEMOD_MODES = {
 }
 CURRENT_DEMOD = 'NFM'  # Default demodulation mode
 zoom_step = 0.1e6  # 100 kHz zoom step
-PERSISTENCE_HISTORY = []
 PERSISTENCE_ALPHA = 0.7  # Decay factor
 PERSISTENCE_LENGTH = 10  # Number of traces to keep
+PERSISTENCE_HISTORY = SpectrumHistory(PERSISTENCE_LENGTH)
 PERSISTENCE_MODE = False
 SURFACE_MODE = False
 SURFACE_ANGLE = 45  # Viewing angle in degrees
@@ -164,15 +187,42 @@ GRADIENT_COLORS = [
     (255, 0, 0),    # Red
 ]
 DISPLAY_MODES = ['SPECTRUM', 'WATERFALL', 'PERSISTENCE', 'SURFACE', 'GRADIENT', 'VECTOR']
+MODE_KEYS = {ord(str(i + 1)): i for i in range(len(DISPLAY_MODES))}  # Keys 1-6 -> mode index
 current_display_mode = 'SPECTRUM'
 DEFAULT_PPM = 0  # Default PPM correction value
+RECORD_CHUNK_SAMPLES = 1 << 20  # IQ samples per read when recording to disk
 LAST_SCAN_RESULTS = []  # Store the last scan results
+SIGNAL_DTYPE = np.dtype([  # One scan result record
+    ('frequency', 'f8'),
+    ('power', 'f4'),
+    ('bandwidth', 'f4'),
+    ('type_id', 'u1'),  # Index into SIGNAL_TYPE_NAMES
+])
 RTL_COMMAND = ""
 SQUELCH = -60
 PEAK_POWER = 0
+CP_OK = 0   # Success/status text attr, set by init_colors()
+CP_ERR = 0  # Error text attr, set by init_colors()
+CP_HL = 0   # Bold yellow highlight attr, set by init_colors()
+CP_ACCENT = 0  # Plain yellow attr, set by init_colors()
+CP_TEXT = 0    # Normal white text attr, set by init_colors()
+CP_INFO = 0    # Cyan footer/info attr, set by init_colors()
+SPECTRUM_BAR_ATTRS = None  # Attrs matching SPECTRUM_BAR_PAIRS, set by init_colors()
+PAIR_ATTRS = None  # curses.color_pair() attr of every pair number in use, set by init_colors()
+HEADER_CACHE = {'key': None, 'lines': None}  # Last composed header lines and the values they show
+# str.translate() table dropping the characters an APRS packet line should not show.
+# Decoded packets only hold chr(0)..chr(255)
+APRS_STRIP_TABLE = {i: None for i in range(256) if not (chr(i).isprintable() or chr(i).isspace())}
+FRAME_STATS = {'data': None, 'peak': None, 'mean': None}  # Spectrum frame draw_header() last measured, and its stats
+HELP_LINES = None  # Help screen rows as (x, text, attr) segments, built on first use by help_lines()
+SETTINGS_CACHE = {'stamp': None, 'settings': None}  # Last parsed settings file and its (mtime, size)
+BOOKMARKS_CACHE = {'stamp': None, 'bookmarks': None}  # Last parsed bookmark file and its (mtime, size)
+BAND_LOOKUP = {}  # tolerance -> band edge table used by band_at()
+SPECTRUM_ROWS = {'chars': None, 'attrs': None}  # Rows draw_spectrogram() last wrote, reset when the screen may have changed
 
 
 def init_colors():
+    global CP_OK, CP_ERR, CP_HL, CP_ACCENT, CP_TEXT, CP_INFO, SPECTRUM_BAR_ATTRS, PAIR_ATTRS
     curses.start_color()
     curses.init_pair(1, curses.COLOR_YELLOW, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_WHITE, curses.COLOR_BLACK)
@@ -184,6 +234,35 @@ def init_colors():
     for i, color in enumerate(WATERFALL_COLORS):
         curses.init_pair(10 + i, color, curses.COLOR_BLACK)
 
+    # Resolve the common attrs once instead of on every addstr
+    CP_OK = curses.color_pair(4)
+    CP_ERR = curses.color_pair(3)
+    CP_HL = curses.color_pair(1) | curses.A_BOLD
+    CP_ACCENT = curses.color_pair(1)
+    CP_TEXT = curses.color_pair(2)
+    CP_INFO = curses.color_pair(5)
+    SPECTRUM_BAR_ATTRS = np.array([[curses.color_pair(pair) | curses.A_BOLD for pair in tier_pairs]
+                                   for tier_pairs in SPECTRUM_BAR_PAIRS])
+    PAIR_ATTRS = [curses.color_pair(pair) for pair in range(10 + len(WATERFALL_COLORS))]
+
+
+def help_lines():
+    """Lay out help_content once as rows of (x, text, attr) segments, blank rows are empty"""
+    global HELP_LINES
+    if HELP_LINES is None:
+        HELP_LINES = []
+        for section_title, commands in help_content:
+            border = "+" + "-" * (len(section_title) + 2) + "+"
+            HELP_LINES.append(((2, border, CP_OK),))
+            HELP_LINES.append(((2, "| " + section_title + " |", CP_OK | curses.A_BOLD),))
+            HELP_LINES.append(((2, border, CP_OK),))
+            for key, description in commands:
+                HELP_LINES.append(((4, f"[ {key:6} ]", CP_HL),
+                                   (15, "->", CP_TEXT),
+                                   (18, description, CP_TEXT)))
+            HELP_LINES.append(())
+    return HELP_LINES
+
 
 def showhelp(stdscr):
     """Display help information with scrolling capability"""
@@ -193,57 +272,25 @@ def showhelp(stdscr):
     scroll_pos = 0
     max_scroll = max(0, total_height - (max_height - 2))
     stdscr.nodelay(0)
+    lines = help_lines()
     while True:
         stdscr.clear()
         current_line = 0
         title = "PySpecSDR Help"
-        stdscr.addstr(0, 2, title, curses.color_pair(1) | curses.A_BOLD)
+        stdscr.addstr(0, 2, title, CP_HL)
         current_line += 1
-        stdscr.addstr(1, 1, "-" * (max_width - 2), curses.color_pair(2))
+        stdscr.addstr(1, 1, "-" * (max_width - 2), CP_TEXT)
         current_line += 1
         startline = 2
-        for section_title, commands in help_content:
-            if current_line - scroll_pos >= 0 and current_line - scroll_pos < max_height - 3:
+        # Only the help rows inside the window are drawn, the layout itself is cached
+        first = max(0, scroll_pos - current_line)
+        last = max(first, scroll_pos - current_line + max_height - 3)
+        for line, segments in enumerate(lines[first:last], start=current_line + first):
+            for x, text, attr in segments:
                 try:
-                    stdscr.addstr(startline + current_line - scroll_pos, 2, 
-                                "+" + "-" * (len(section_title) + 2) + "+", 
-                                curses.color_pair(4))
+                    stdscr.addstr(startline + line - scroll_pos, x, text, attr)
                 except curses.error:
                     pass
-            current_line += 1
-
-            if current_line - scroll_pos >= 0 and current_line - scroll_pos < max_height - 3:
-                try:
-                    stdscr.addstr(startline + current_line - scroll_pos, 2, 
-                                "| " + section_title + " |", 
-                                curses.color_pair(4) | curses.A_BOLD)
-                except curses.error:
-                    pass
-            current_line += 1
-
-            if current_line - scroll_pos >= 0 and current_line - scroll_pos < max_height - 3:
-                try:
-                    stdscr.addstr(startline + current_line - scroll_pos, 2, 
-                                "+" + "-" * (len(section_title) + 2) + "+", 
-                                curses.color_pair(4))
-                except curses.error:
-                    pass
-            current_line += 1
-
-            for key, description in commands:
-                if current_line - scroll_pos >= 0 and current_line - scroll_pos < max_height - 3:
-                    try:
-                        key_str = f"[ {key:6} ]"
-                        stdscr.addstr(startline + current_line - scroll_pos, 4, key_str, 
-                                    curses.color_pair(1) | curses.A_BOLD)
-                        stdscr.addstr(startline + current_line - scroll_pos, 15, "->", 
-                                    curses.color_pair(2))
-                        stdscr.addstr(startline + current_line - scroll_pos, 18, description, 
-                                    curses.color_pair(2))
-                    except curses.error:
-                        pass
-                current_line += 1
-            current_line += 1
 
         # Draw scrollbar
         if total_height > max_height - 2:
@@ -254,7 +301,7 @@ def showhelp(stdscr):
         else:
             char = "|"
         try:
-            stdscr.addstr(y, max_width - 1, char, curses.color_pair(2))
+            stdscr.addstr(y, max_width - 1, char, CP_TEXT)
         except curses.error:
             pass
 
@@ -263,7 +310,7 @@ def showhelp(stdscr):
         nav_pos = (max_width - len(nav_text)) // 2
         try:
             stdscr.addstr(max_height - 1, nav_pos, nav_text, 
-                         curses.color_pair(5) | curses.A_BOLD)
+                         CP_INFO | curses.A_BOLD)
         except curses.error:
             pass
 
@@ -294,7 +341,7 @@ def start_pipe_recording(stdscr):
     create_pipe()
     PIPE_FILE = open_file_pipe()
     USE_PIPE = True
-    stdscr.addstr(0, 0, f"Started recording to {PIPE_PATH}", curses.color_pair(4))
+    stdscr.addstr(0, 0, f"Started recording to {PIPE_PATH}", CP_OK)
     time.sleep(1)
 
 
@@ -304,13 +351,13 @@ def stop_pipe_recording(stdscr):
     close_file_pipe(PIPE_FILE)
     clean_pipe(None,None)
     PIPE_FILE = None
-    stdscr.addstr(0, 0, "Recording stopped", curses.color_pair(4))
+    stdscr.addstr(0, 0, "Recording stopped", CP_OK)
     time.sleep(1)
 
 
 def setfreq(stdscr):
     ui.draw_clearheader(stdscr)
-    stdscr.addstr(0,0,"Enter frequency in Hz: ",curses.color_pair(1) | curses.A_BOLD)
+    stdscr.addstr(0,0,"Enter frequency in Hz: ",CP_HL)
     curses.echo()
     curses.curs_set(1)
     stdscr.nodelay(False)
@@ -341,59 +388,52 @@ def draw_header(stdscr, freq_data, frequencies, center_freq, bandwidth, gain, st
     global SQUELCH, PEAK_POWER
     max_height, max_width = stdscr.getmaxyx()
 
-    x_pos = 0
     if is_recording:
         recording_text = f"Recording: {recording_duration:.1f}s"
         stdscr.addstr(0, max_width - len(recording_text) - 1, recording_text, 
-                     curses.color_pair(3) | curses.A_BOLD)
-
-    # Draw the colored header
-    freq_text = f"req: {center_freq/1e6:.6f} MHz"
-    bw_text = f"andwidth: {bandwidth/1e6:.2f} MHz"
-    gain_text = f"ain: {gain}"
-    samples_text = f"amples: {2**SAMPLES}"
-    step_text = f"ep: {step/1e6:.3f} MHz"
-    ppm_text = f"PM: {sdr.ppm}"  # Add PPM text
-    agc_text = f"GC: {'On' if AGC_ENABLED else 'Off'}"
-
-    x_pos = 0
-    stdscr.addstr(0, x_pos, "F", curses.color_pair(1) | curses.A_BOLD)
-    stdscr.addstr(0, x_pos+1, freq_text, curses.color_pair(2))
-    x_pos += len(freq_text) + 3
-    stdscr.addstr(0, x_pos, "B", curses.color_pair(1) | curses.A_BOLD)
-    stdscr.addstr(0, x_pos+1, bw_text, curses.color_pair(2))
-    x_pos += len(bw_text) + 3
-    stdscr.addstr(0, x_pos, "G", curses.color_pair(1) | curses.A_BOLD)
-    stdscr.addstr(0, x_pos+1, gain_text, curses.color_pair(2))
-    x_pos = 0
-    stdscr.addstr(1, x_pos, "S", curses.color_pair(1) | curses.A_BOLD)
-    stdscr.addstr(1, x_pos+1, samples_text, curses.color_pair(2))
-    x_pos += len(samples_text) + 3
-    stdscr.addstr(1, x_pos, "S", curses.color_pair(2))
-    stdscr.addstr(1, x_pos+1, "t", curses.color_pair(1) | curses.A_BOLD)
-    stdscr.addstr(1, x_pos+2, step_text, curses.color_pair(2))
-    x_pos += len(step_text) + 4
-    try:
-        stdscr.addstr(1, x_pos, "P", curses.color_pair(1) | curses.A_BOLD)
-        stdscr.addstr(1, x_pos+1, ppm_text, curses.color_pair(2))
-    except curses.error:
-        pass  # Ignore if screen is too small
-    x_pos += len(ppm_text) + 3
-    stdscr.addstr(1, x_pos, "A", curses.color_pair(1) | curses.A_BOLD)
-    stdscr.addstr(1, x_pos+1, agc_text, curses.color_pair(2))
-    x_pos += len(agc_text) + 3
-    stdscr.addstr(1, x_pos, f"Squelch:{SQUELCH:<4}", curses.color_pair(2))
+                     CP_ERR | curses.A_BOLD)
+
+    # Draw the colored header, the lines are only rebuilt when a shown value changes
+    key = (center_freq, bandwidth, gain, SAMPLES, step, sdr.ppm, AGC_ENABLED, SQUELCH)
+    if HEADER_CACHE['key'] != key:
+        freq_text = f"req: {center_freq/1e6:.6f} MHz"
+        bw_text = f"andwidth: {bandwidth/1e6:.2f} MHz"
+        gain_text = f"ain: {gain}"
+        samples_text = f"amples: {2**SAMPLES}"
+        step_text = f"ep: {step/1e6:.3f} MHz"
+        ppm_text = f"PM: {sdr.ppm}"  # Add PPM text
+        agc_text = f"GC: {'On' if AGC_ENABLED else 'Off'}"
+
+        line0 = f"F{freq_text}  B{bw_text}  G{gain_text}"
+        line1 = f"S{samples_text}  St{step_text}  P{ppm_text}  A{agc_text}  Squelch:{SQUELCH:<4}"
+        step_col = len(samples_text) + 3
+        ppm_col = step_col + len(step_text) + 4
+        agc_col = ppm_col + len(ppm_text) + 3
+        HEADER_CACHE['key'] = key
+        HEADER_CACHE['lines'] = [
+            (0, line0, (0, len(freq_text) + 3, len(freq_text) + len(bw_text) + 6)),
+            (1, line1, (0, step_col + 1, ppm_col, agc_col)),
+        ]
+
+    # One addstr per line, then the hotkey letters are highlighted in place with chgat
+    for y, line, hotkey_cols in HEADER_CACHE['lines']:
+        stdscr.addstr(y, 0, line, CP_TEXT)
+        for col in hotkey_cols:
+            stdscr.chgat(y, col, 1, CP_HL)
 
     # Add signal strength indicator
     PEAK_POWER = np.max(freq_data)
     avg_power = np.mean(freq_data)
+    FRAME_STATS['data'] = freq_data
+    FRAME_STATS['peak'] = PEAK_POWER
+    FRAME_STATS['mean'] = avg_power
     # PEAK_POWER = avg_power
-    strength_text = f"Peak: {np.max(freq_data):.1f} dB Avg: {avg_power:.1f} dB"
-    stdscr.addstr(1, max_width - len(strength_text) - 1, strength_text, curses.color_pair(2))
+    strength_text = f"Peak: {PEAK_POWER:.1f} dB Avg: {avg_power:.1f} dB"
+    stdscr.addstr(1, max_width - len(strength_text) - 1, strength_text, CP_TEXT)
 
     # debug string
     # txt = str(sdr.sample_rate)
-    # stdscr.addstr(0, max_width - len(txt) - 1, txt, curses.color_pair(2) | curses.A_BOLD)
+    # stdscr.addstr(0, max_width - len(txt) - 1, txt, CP_TEXT | curses.A_BOLD)
 
 
 def draw_spectrogram(stdscr, freq_data, frequencies, center_freq, bandwidth, gain, step, 
@@ -407,93 +447,100 @@ def draw_spectrogram(stdscr, freq_data, frequencies, center_freq, bandwidth, gai
     display_width = max_width - 7  # Reserve space for dB scale
     display_height = max_height - 4  # Reserve space for header and labels
 
-    # Clear the display area (preserve header)
-    for y in range(2, max_height-1):
-        try:
-            stdscr.addstr(y, 0, " " * (max_width-1), curses.color_pair(1))
-        except curses.error:
-            pass
+    # Blank the frequency axis row, the rows above it are rewritten in full below
+    try:
+        stdscr.addstr(display_height + 2, 0, " " * max_width, CP_ACCENT)
+    except curses.error:
+        pass
 
     # Set fixed dB range for display with noise floor adjustment
-    min_db = np.min(freq_data[np.isfinite(freq_data)])
-    max_db = np.max(freq_data[np.isfinite(freq_data)])
+    # draw_header() has just measured this same frame. A finite mean means every bin is
+    # finite, so the stats below need neither a finite-only copy nor a rescan for the peak
+    if FRAME_STATS['data'] is freq_data and np.isfinite(FRAME_STATS['mean']):
+        finite_data = freq_data
+        max_db = FRAME_STATS['peak']
+    else:
+        finite_data = freq_data[np.isfinite(freq_data)]  # Filtered once for all the stats below
+        max_db = np.max(finite_data)
 
     # Calculate noise floor (using lower percentile)
-    noise_floor = np.percentile(freq_data[np.isfinite(freq_data)], 20)
+    noise_floor = partition_percentile(finite_data, 20)
 
     # Adjust dynamic range to emphasize signals above noise
     db_range = max_db - noise_floor
     display_min = noise_floor - (db_range * 0.1)  # Show some noise below floor
     display_max = max_db + (db_range * 0.05)  # Add headroom
 
-    # Draw dB scale on the left
-    for i in range(display_height):
+    # Resample data to fit display width, keeping the strongest bin of each column.
+    # The scaling below is monotonic, so it can be applied after the reduction
+    block = len(freq_data) // display_width
+    if block >= 1:
+        resampled = freq_data[:block * display_width].reshape(display_width, block).max(axis=1)
+    else:
+        # Wider than the spectrum, interpolate with the cached sample points
+        resampled = resample_rows(freq_data[np.newaxis], display_width)[0]
+
+    # Normalize data for display using adjusted range, then apply non-linear scaling
+    # to emphasize signals. resampled is a fresh array, so each step works in place
+    resampled = resampled.astype(np.result_type(resampled, display_min), copy=False)
+    resampled -= display_min
+    resampled /= display_max - display_min
+    np.clip(resampled, 0, 1, out=resampled)
+    np.power(resampled, 0.7, out=resampled)  # Adjust exponent to taste
+
+    # Bar height of every column, the area above the bars is already cleared
+    finite = np.isfinite(resampled)
+    values = np.where(finite, resampled, 0)
+    heights = np.minimum((values * display_height).astype(int), display_height)
+
+    # Signal strength tier per column (noise, weak, medium, strong), and for every
+    # cell of a bar whether it sits in the upper part of it
+    tiers = np.searchsorted(SPECTRUM_TIER_LIMITS, values)
+    rows = np.arange(display_height)[:, None]
+    tops = display_height - heights
+    rel_pos = (rows - tops) / np.maximum(heights, 1)
+    upper = rel_pos > np.where(tiers == 0, 0.7, 0.5)
+    ys, xs = np.nonzero((rows >= tops) & finite)
+
+    # Compose every display row as bytes, the dB scale in the left margin and the
+    # spectrum bars after it, write each with a single addstr (which also blanks
+    # the rest of the row) and color the runs of scale and bar cells with chgat
+    cell_tiers = tiers[xs]
+    cell_upper = upper[ys, xs].astype(np.intp)
+    chars = np.full((display_height, max_width), ord(' '), dtype=np.uint8)
+    attrs = np.full((display_height, max_width), CP_ACCENT, dtype=np.int64)
+    chars[ys, xs + spectrum_pad] = SPECTRUM_BAR_CHARS[cell_tiers, cell_upper]
+    attrs[ys, xs + spectrum_pad] = SPECTRUM_BAR_ATTRS[cell_tiers, cell_upper]
+
+    # dB scale on the left, every 3 lines
+    for i in range(0, display_height, 3):
         db_value = display_max - (i * (display_max - display_min) / display_height)
-        if i % 3 == 0:  # Show scale every 3 lines
-            db_label = f"{db_value:4.0f}dB"
-            try:
-                stdscr.addstr(i + 2, 0, db_label, curses.color_pair(2))
-                # Add scale markers
-                # stdscr.addstr(i + 2, 6, "|", curses.color_pair(2))
-            except curses.error:
-                pass
-
-    # Normalize data for display using adjusted range
-    normalized_data = np.clip((freq_data - display_min) / (display_max - display_min), 0, 1)
-
-    # Apply non-linear scaling to emphasize signals
-    normalized_data = np.power(normalized_data, 0.7)  # Adjust exponent to taste
-
-    # Resample data to fit display width
-    resampled = np.interp(
-        np.linspace(0, len(normalized_data) - 1, display_width),
-        np.arange(len(normalized_data)),
-        normalized_data
-    )
-
-    # Draw spectrum with improved character selection
-    for x, value in enumerate(resampled):
-        if np.isfinite(value):
-            # Calculate height in display units
-            height = int(value * display_height)
-            height = min(height, display_height)
-
-            # First clear the entire column
-            for y in range(display_height):
-                try:
-                    stdscr.addstr(y + 2, x + spectrum_pad, " ", curses.color_pair(1))
-                except curses.error:
-                    pass
-
-            # Then draw the bar with varied characters based on signal strength
-            peak_height = 0
-            for y in range(display_height - height, display_height):
-                try:
-                    # Calculate relative position in the bar
-                    rel_pos = (y - (display_height - height)) / height if height > 0 else 0
-
-                    # Select character based on signal strength and position
-                    if value > 0.8:  # Strong signals
-                        char = "#" if rel_pos > 0.5 else "="
-                        color = curses.color_pair(14)
-                    elif value > 0.4:  # Medium signals
-                        char = "=" if rel_pos > 0.5 else "-"
-                        color = curses.color_pair(13)
-                    elif value > 0.2:  # Weak signals
-                        char = "-" if rel_pos > 0.5 else "."
-                        color = curses.color_pair(12)
-                    else:  # Noise level
-                        if rel_pos > 0.7:
-                            char = "."
-                            color = curses.color_pair(11)
-                        else:
-                            char = " "
-                            color = curses.color_pair(10)
-
-                    stdscr.addstr(y + 2, x + spectrum_pad, char, color | curses.A_BOLD )
-
-                except curses.error:
-                    pass
+        db_label = f"{db_value:4.0f}dB".encode()[:spectrum_pad]
+        chars[i, :len(db_label)] = np.frombuffer(db_label, dtype=np.uint8)
+        attrs[i, :len(db_label)] = CP_TEXT
+
+    # Only rows that differ from the last frame are written again
+    last_chars, last_attrs = SPECTRUM_ROWS['chars'], SPECTRUM_ROWS['attrs']
+    if last_chars is not None and last_chars.shape == chars.shape:
+        changed_rows = np.flatnonzero((chars != last_chars).any(axis=1)
+                                      | (attrs != last_attrs).any(axis=1)).tolist()
+    else:
+        changed_rows = range(display_height)
+    SPECTRUM_ROWS['chars'], SPECTRUM_ROWS['attrs'] = chars, attrs
+
+    for y in changed_rows:
+        row_attrs = attrs[y]
+        bounds = np.flatnonzero(row_attrs[1:] != row_attrs[:-1]) + 1
+        starts = np.concatenate(([0], bounds)).tolist()
+        ends = np.concatenate((bounds, [max_width])).tolist()
+        try:
+            stdscr.addstr(y + 2, 0, chars[y].tobytes(), CP_ACCENT)
+            for start, end in zip(starts, ends):
+                attr = int(row_attrs[start])
+                if attr != CP_ACCENT:
+                    stdscr.chgat(y + 2, start, end - start, attr)
+        except curses.error:
+            pass
 
     # Use standardized frequency labels
     draw_frequency_labels(stdscr, center_freq, bandwidth, display_height, display_width)
@@ -521,7 +568,7 @@ def show_aprs_decoder(stdscr, sdr, sample_rate):
             for i, packet in enumerate(packets):
                 if packet and 4 + i < stdscr.getmaxyx()[0]:
                     # Clean the packet string - remove null chars and non-printable chars
-                    clean_packet = ''.join(c for c in packet if c.isprintable() or c.isspace())
+                    clean_packet = packet.translate(APRS_STRIP_TABLE)
                     # Truncate to screen width
                     max_width = stdscr.getmaxyx()[1] - 1
                     display_str = clean_packet[:max_width]
@@ -583,12 +630,12 @@ def show_morse_decoder(stdscr, sdr, sample_rate):
 
                 # Show header
                 header = "Morse Code Decoder (Press 'q' to quit)"
-                stdscr.addstr(0, 2, header, curses.color_pair(1) | curses.A_BOLD)
-                stdscr.addstr(1, 2, "-" * len(header), curses.color_pair(2))
+                stdscr.addstr(0, 2, header, CP_HL)
+                stdscr.addstr(1, 2, "-" * len(header), CP_TEXT)
 
                 # Show current frequency
                 freq_info = f"Frequency: {sdr.center_freq/1e6:.3f} MHz"
-                stdscr.addstr(2, 2, freq_info, curses.color_pair(2))
+                stdscr.addstr(2, 2, freq_info, CP_TEXT)
 
                 # Show timing information
                 timing_info = (f"Timing Statistics:\n"
@@ -597,10 +644,10 @@ def show_morse_decoder(stdscr, sdr, sample_rate):
                              f"Average gap: {timing['gap']*1000:.1f} ms")
 
                 for i, line in enumerate(timing_info.split('\n')):
-                    stdscr.addstr(4+i, 2, line, curses.color_pair(2))
+                    stdscr.addstr(4+i, 2, line, CP_TEXT)
 
                 # Show decoded text header
-                stdscr.addstr(9, 2, "Decoded Text:", curses.color_pair(1) | curses.A_BOLD)
+                stdscr.addstr(9, 2, "Decoded Text:", CP_HL)
 
                 # Show scrolling decoded text
                 for i, text in enumerate(text_buffer):
@@ -612,21 +659,21 @@ def show_morse_decoder(stdscr, sdr, sample_rate):
 
                         for word in words:
                             if len(current_line) + len(word) + 1 > max_width - 4:
-                                stdscr.addstr(10+line_num, 2, current_line, curses.color_pair(4))
+                                stdscr.addstr(10+line_num, 2, current_line, CP_OK)
                                 current_line = word
                                 line_num += 1
                             else:
                                 current_line += (" " + word if current_line else word)
 
                         if current_line:
-                            stdscr.addstr(10+line_num, 2, current_line, curses.color_pair(4))
+                            stdscr.addstr(10+line_num, 2, current_line, CP_OK)
 
                     except curses.error:
                         # Skip if we run out of screen space
                         pass
 
                 # Show footer
-                stdscr.addstr(max_height-2, 2, "Press 'q' to quit", curses.color_pair(2))
+                stdscr.addstr(max_height-2, 2, "Press 'q' to quit", CP_TEXT)
 
                 stdscr.refresh()
 
@@ -643,7 +690,7 @@ def show_morse_decoder(stdscr, sdr, sample_rate):
 
             except RuntimeError as e:
                 # Handle stream errors
-                stdscr.addstr(max_height-1, 2, f"Stream error: {str(e)}", curses.color_pair(3))
+                stdscr.addstr(max_height-1, 2, f"Stream error: {str(e)}", CP_ERR)
                 stdscr.refresh()
                 time.sleep(1)
                 continue
@@ -664,38 +711,44 @@ def show_morse_decoder(stdscr, sdr, sample_rate):
 
 def audio_callback(outdata, frames, time, status):
     """Audio callback that writes stereo data to the output."""
-    if len(audio_buffer) > 0:
-        data = np.concatenate(list(audio_buffer))
-        if len(data) >= frames:
-            outdata[:] = data[:frames].reshape(-1, 2)  # Reshape for stereo output
-            audio_buffer.clear()
-            if len(data) > frames:
-                audio_buffer.append(data[frames:])
-        else:
-            outdata[:] = np.zeros((frames, 2))  # Stereo output
-    else:
-        outdata[:] = np.zeros((frames, 2))  # Stereo output
+    if not audio_buffer.read_into(outdata):
+        outdata.fill(0)  # Not enough audio queued, play silence
 
 
 def load_bookmarks():
     try:
-        with open(BOOKMARK_FILE, 'r') as f:
-            return json.load(f)
+        # Reuse the last parse while the file is unchanged on disk
+        st = os.stat(BOOKMARK_FILE)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if BOOKMARKS_CACHE['stamp'] != stamp:
+            with open(BOOKMARK_FILE, 'r') as f:
+                BOOKMARKS_CACHE['bookmarks'] = json.load(f)
+            BOOKMARKS_CACHE['stamp'] = stamp
+        return dict(BOOKMARKS_CACHE['bookmarks'])
     except (FileNotFoundError, json.JSONDecodeError):
         return {}
 
 
+def write_bookmarks(bookmarks):
+    """Write all bookmarks back to the bookmark file"""
+    # Write to a temporary file and swap it in, so a reader never sees a partial file
+    tmp_file = BOOKMARK_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(bookmarks, f, indent=2)
+    os.replace(tmp_file, BOOKMARK_FILE)
+    BOOKMARKS_CACHE['stamp'] = None
+
+
 def save_bookmark(name, freq,bandwidth):
     bookmarks = load_bookmarks()
     bookmarks[name] = [freq, CURRENT_DEMOD, bandwidth]
-    with open(BOOKMARK_FILE, 'w') as f:
-        json.dump(bookmarks, f, indent=2)
+    write_bookmarks(bookmarks)
 
 
 def add_bookmark(stdscr, freq,bandwidth):
     max_height, max_width = stdscr.getmaxyx()
     ui.draw_clearheader(stdscr)
-    stdscr.addstr(0, 0, "Enter bookmark name: ", curses.color_pair(1) | curses.A_BOLD)
+    stdscr.addstr(0, 0, "Enter bookmark name: ", CP_HL)
     curses.echo()
     curses.curs_set(1)
     stdscr.nodelay(False)
@@ -718,122 +771,160 @@ def show_bookmarks(stdscr):
     # Initialize pagination variables
     max_height, max_width = stdscr.getmaxyx()
     items_per_page = max_height - 7  # Reserve space for header and footer
-    total_items = len(bookmarks)
+    items = list(bookmarks.items())  # Numbered (name, details) list, rebuilt only on deletes
+    total_items = len(items)
     total_pages = (total_items + items_per_page - 1) // items_per_page
     current_page = 0
 
-    while True:
-        stdscr.clear()
+    deleted = False  # Deletions are written back once, when the screen is left
+    try:
+        while True:
+            stdscr.clear()
 
-        # Draw header
-        header = "Bookmarks"
-        stdscr.addstr(0, 2, header, curses.color_pair(1) | curses.A_BOLD)
-        stdscr.addstr(1, 2, "-" * len(header), curses.color_pair(2))
+            # Draw header
+            header = "Bookmarks"
+            stdscr.addstr(0, 2, header, CP_HL)
+            stdscr.addstr(1, 2, "-" * len(header), CP_TEXT)
 
-        # Calculate slice for current page
-        start_idx = current_page * items_per_page
-        end_idx = min(start_idx + items_per_page, total_items)
-        current_items = list(bookmarks.items())[start_idx:end_idx]
-
-        # Display bookmarks for current page
-        for i, (name, details) in enumerate(current_items, 1):
-            freq = details[0]
-            mode = details[1]
-            band = details[2]
-            abs_index = start_idx + i
-            line = f"{abs_index:2d}. {name:<20}: {freq/1e6:.3f} MHz {mode:<3} {band:>9}Hz"
+            # Calculate slice for current page
+            start_idx = current_page * items_per_page
+            end_idx = min(start_idx + items_per_page, total_items)
+            current_items = items[start_idx:end_idx]
+
+            # Display bookmarks for current page
+            for i, (name, details) in enumerate(current_items, 1):
+                freq = details[0]
+                mode = details[1]
+                band = details[2]
+                abs_index = start_idx + i
+                line = f"{abs_index:2d}. {name:<20}: {freq/1e6:.3f} MHz {mode:<3} {band:>9}Hz"
+                try:
+                    stdscr.addstr(i + 2, 2, line, CP_TEXT)
+                except curses.error:
+                    pass
+
+            # Draw footer with navigation help
+            footer = f"Page {current_page + 1}/{total_pages} | [n]ext/[p]rev page | [d]elete | [q]uit"
             try:
-                stdscr.addstr(i + 2, 2, line, curses.color_pair(2))
+                stdscr.addstr(max_height-2, 2, footer, CP_INFO)
+                stdscr.addstr(max_height-1, 2, "Choice: ", CP_HL)
             except curses.error:
                 pass
 
-        # Draw footer with navigation help
-        footer = f"Page {current_page + 1}/{total_pages} | [n]ext/[p]rev page | [d]elete | [q]uit"
-        try:
-            stdscr.addstr(max_height-2, 2, footer, curses.color_pair(5))
-            stdscr.addstr(max_height-1, 2, "Choice: ", curses.color_pair(1) | curses.A_BOLD)
-        except curses.error:
-            pass
-
-        # Handle input
-        curses.echo()
-        curses.curs_set(1)
-        stdscr.nodelay(False)
+            # Handle input
+            curses.echo()
+            curses.curs_set(1)
+            stdscr.nodelay(False)
 
-        try:
-            choice = stdscr.getstr().decode('utf-8').lower()
+            try:
+                choice = stdscr.getstr().decode('utf-8').lower()
 
-            if choice == 'q':
-                break
-            elif choice == 'n' and current_page < total_pages - 1:
-                current_page += 1
-                continue
-            elif choice == 'p' and current_page > 0:
-                current_page -= 1
-                continue
-            elif choice == 'd':
-                # Handle bookmark deletion
-                stdscr.addstr(max_height-1, 2, "Enter number to delete: ", 
-                            curses.color_pair(3) | curses.A_BOLD)
-                try:
-                    del_choice = int(stdscr.getstr().decode('utf-8'))
-                    if 1 <= del_choice <= total_items:
-                        # Get bookmark name and delete it
-                        del_name = list(bookmarks.keys())[del_choice - 1]
-                        del bookmarks[del_name]
-                        # Save updated bookmarks
-                        with open(BOOKMARK_FILE, 'w') as f:
-                            json.dump(bookmarks, f, indent=2)
-                        # Update pagination variables
-                        total_items = len(bookmarks)
-                        total_pages = (total_items + items_per_page - 1) // items_per_page
-                        current_page = min(current_page, total_pages - 1)
-                        show_popup_msg(stdscr, f"Deleted bookmark: {del_name}")
-                        if not bookmarks:
-                            return None
-                except ValueError:
-                    show_popup_msg(stdscr, "Invalid selection!", error=True)
-            else:
-                try:
-                    choice_num = int(choice)
-                    if 1 <= choice_num <= total_items:
-                        return list(bookmarks.values())[choice_num - 1]
-                except ValueError:
-                    show_popup_msg(stdscr, "Invalid selection!", error=True)
+                if choice == 'q':
+                    break
+                elif choice == 'n' and current_page < total_pages - 1:
+                    current_page += 1
+                    continue
+                elif choice == 'p' and current_page > 0:
+                    current_page -= 1
+                    continue
+                elif choice == 'd':
+                    # Handle bookmark deletion
+                    stdscr.addstr(max_height-1, 2, "Enter number to delete: ", 
+                                CP_ERR | curses.A_BOLD)
+                    try:
+                        del_choice = int(stdscr.getstr().decode('utf-8'))
+                        if 1 <= del_choice <= total_items:
+                            # Get bookmark name and delete it
+                            del_name = items[del_choice - 1][0]
+                            del bookmarks[del_name]
+                            deleted = True
+                            # Update pagination variables
+                            items = list(bookmarks.items())
+                            total_items = len(items)
+                            total_pages = (total_items + items_per_page - 1) // items_per_page
+                            current_page = min(current_page, total_pages - 1)
+                            show_popup_msg(stdscr, f"Deleted bookmark: {del_name}")
+                            if not bookmarks:
+                                return None
+                    except ValueError:
+                        show_popup_msg(stdscr, "Invalid selection!", error=True)
+                else:
+                    try:
+                        choice_num = int(choice)
+                        if 1 <= choice_num <= total_items:
+                            return items[choice_num - 1][1]
+                    except ValueError:
+                        show_popup_msg(stdscr, "Invalid selection!", error=True)
 
-        except curses.error:
-            pass
-        finally:
-            stdscr.nodelay(True)
-            curses.noecho()
-            curses.curs_set(0)
+            except curses.error:
+                pass
+            finally:
+                stdscr.nodelay(True)
+                curses.noecho()
+                curses.curs_set(0)
 
-    return None
+        return None
+    finally:
+        if deleted:
+            write_bookmarks(bookmarks)
 
 
 def record_signal(sdr, duration, filename):
-    """Record raw IQ samples to a file"""
-    samples = sdr.read_samples(int(duration * sdr.sample_rate))
-    np.save(filename, samples)
+    """Record raw IQ samples to a file
+
+    Samples are read chunk by chunk straight into a memory-mapped .npy file,
+    so long recordings do not have to fit in memory.
+    """
+    if not filename.endswith('.npy'):
+        filename += '.npy'  # Same naming as np.save
+    total = int(duration * sdr.sample_rate)
+    samples = np.lib.format.open_memmap(filename, mode='w+', dtype=np.complex64, shape=(total,))
+    for start in range(0, total, RECORD_CHUNK_SAMPLES):
+        sdr.read_samples_into(samples[start:start + RECORD_CHUNK_SAMPLES])
+    samples.flush()
     return samples
 
 
 def play_recorded_signal(filename):
-    """Play back recorded IQ samples"""
-    samples = np.load(filename)
+    """Play back recorded IQ samples, memory-mapped rather than loaded"""
+    samples = np.load(filename, mmap_mode='r')
     return samples
 
 
+def band_at(freq, tolerance=0.0):
+    """Key of the first band preset whose range, widened by tolerance, holds freq, or None
+
+    Gives the same band as checking BAND_PRESET_ITEMS in order, but bisects a
+    table of all band edges instead: the answer only changes at an edge.
+    """
+    table = BAND_LOOKUP.get(tolerance)
+    if table is None:
+        def first_band(f):
+            for band, (start, end, _) in BAND_PRESET_ITEMS:
+                if (start - tolerance) <= f <= (end + tolerance):
+                    return band
+            return None
+
+        edges = sorted({start - tolerance for _, (start, _, _) in BAND_PRESET_ITEMS}
+                       | {end + tolerance for _, (_, end, _) in BAND_PRESET_ITEMS})
+        on_edge = [first_band(edge) for edge in edges]
+        # Band between edges[i - 1] and edges[i], with None outside all of them
+        between = [None] + [first_band((lo + hi) / 2) for lo, hi in zip(edges, edges[1:])] + [None]
+        table = BAND_LOOKUP[tolerance] = (edges, on_edge, between)
+
+    edges, on_edge, between = table
+    i = bisect.bisect_left(edges, freq)
+    if i < len(edges) and edges[i] == freq:
+        return on_edge[i]
+    return between[i]
+
+
 def save_settings(sdr, bandwidth, freq_step, samples, agc_enabled):
     """Save current SDR settings to a config file"""
     config = configparser.ConfigParser()
 
     # Find current band (if any)
-    current_band = None
-    for band, (start, end, _) in BAND_PRESETS.items():
-        if start <= sdr.center_freq <= end:
-            current_band = band
-            break
+    current_band = band_at(sdr.center_freq)
 
     config['SDR'] = {
         'frequency': str(sdr.center_freq),
@@ -847,8 +938,12 @@ def save_settings(sdr, bandwidth, freq_step, samples, agc_enabled):
         'ppm': str(sdr.ppm)  # Add PPM to saved settings
     }
 
-    with open(SETTINGS_FILE, 'w') as configfile:
+    # Write to a temporary file and swap it in, so a reader never sees a partial file
+    tmp_file = SETTINGS_FILE + '.tmp'
+    with open(tmp_file, 'w') as configfile:
         config.write(configfile)
+    os.replace(tmp_file, SETTINGS_FILE)
+    SETTINGS_CACHE['stamp'] = None
 
 
 def load_settings():
@@ -866,10 +961,20 @@ def load_settings():
         'ppm': '0'  # Add default PPM value
     }
 
-    if os.path.exists(SETTINGS_FILE):
+    try:
+        st = os.stat(SETTINGS_FILE)
+    except OSError:
+        st = None
+
+    if st is not None:
+        # Reuse the last parse while the file is unchanged on disk
+        stamp = (st.st_mtime_ns, st.st_size)
+        if SETTINGS_CACHE['stamp'] == stamp:
+            return dict(SETTINGS_CACHE['settings'])
+
         config.read(SETTINGS_FILE)
         if 'SDR' in config:
-            return {
+            settings = {
                 'frequency': float(config['SDR'].get('frequency', default_settings['frequency'])),
                 'sample_rate': float(config['SDR'].get('sample_rate', default_settings['sample_rate'])),
                 'gain': config['SDR'].get('gain', default_settings['gain']),  # Keep as string
@@ -880,6 +985,9 @@ def load_settings():
                 'current_band': config['SDR'].get('current_band', default_settings['current_band']),
                 'ppm': int(config['SDR'].get('ppm', default_settings['ppm']))
             }
+            SETTINGS_CACHE['stamp'] = stamp
+            SETTINGS_CACHE['settings'] = settings
+            return dict(settings)
 
     # Convert default settings to appropriate types
     return {
@@ -922,9 +1030,9 @@ def adjust_gain(sdr, current_power, gainindex):
 def show_popup_msg(stdscr,msg,error=False,pause=2):
     ui.draw_clearheader(stdscr)
     if error:
-        stdscr.addstr(0, 0, msg, curses.color_pair(3))
+        stdscr.addstr(0, 0, msg, CP_ERR)
     else:
-        stdscr.addstr(0, 0, msg, curses.color_pair(4))
+        stdscr.addstr(0, 0, msg, CP_OK)
     stdscr.refresh()
     time.sleep(pause)
     ui.draw_clearheader(stdscr)
@@ -942,19 +1050,19 @@ def show_band_presets(stdscr):
     current_page = 0
 
     while True:
-        stdscr.clear()
+        stdscr.erase()
 
         # Draw header
         header = "Available Band Presets"
-        stdscr.addstr(0, 2, header, curses.color_pair(1) | curses.A_BOLD)
-        stdscr.addstr(1, 2, "-" * len(header), curses.color_pair(2))
+        stdscr.addstr(0, 2, header, CP_HL)
+        stdscr.addstr(1, 2, "-" * len(header), CP_TEXT)
 
         # Calculate slice for current page
         start_idx = current_page * entries_per_page
         end_idx = min(start_idx + entries_per_page, total_entries)
 
         # Display current page of presets
-        current_items = list(BAND_PRESETS.items())[start_idx:end_idx]
+        current_items = BAND_PRESET_ITEMS[start_idx:end_idx]
         for i, (key, (start, end, description)) in enumerate(current_items, 1):
             # Calculate absolute index for selection
             abs_index = start_idx + i
@@ -965,15 +1073,15 @@ def show_band_presets(stdscr):
                 bw_info = ""
             line = f"{abs_index:2d}. {key:<8} : {description:<25}{bw_info} ({start/1e6:.3f}-{end/1e6:.3f} MHz)"
             try:
-                stdscr.addstr(i + 2, 2, line, curses.color_pair(2))
+                stdscr.addstr(i + 2, 2, line, CP_TEXT)
             except curses.error:
                 pass
 
         # Draw footer with navigation help
         footer = f"Page {current_page + 1}/{total_pages} | [n]ext/[p]rev page | [q]uit | Enter number to select"
         try:
-            stdscr.addstr(max_height-2, 2, footer, curses.color_pair(5))
-            stdscr.addstr(max_height-1, 2, "Choice: ", curses.color_pair(1) | curses.A_BOLD)
+            stdscr.addstr(max_height-2, 2, footer, CP_INFO)
+            stdscr.addstr(max_height-1, 2, "Choice: ", CP_HL)
         except curses.error:
             pass
 
@@ -998,8 +1106,7 @@ def show_band_presets(stdscr):
                 choice_num = int(choice)
                 if 1 <= choice_num <= total_entries:
                     # Get selected band
-                    band_key = list(BAND_PRESETS.keys())[choice_num - 1]
-                    start, end, _ = BAND_PRESETS[band_key]
+                    band_key, (start, end, _) = BAND_PRESET_ITEMS[choice_num - 1]
                     # Use recommended bandwidth if available, otherwise calculate
                     if band_key in BAND_BANDWIDTHS:
                         bandwidth = BAND_BANDWIDTHS[band_key]
@@ -1021,76 +1128,97 @@ def show_band_presets(stdscr):
 
 def scan_frequencies(stdscr, sdr, start_freq, end_freq, threshold, step=SCAN_STEP):
     """Scan frequency range and detect signals above threshold"""
-    signals = []
+    # One record per step at most, filled in place
+    signals = np.empty(int((end_freq - start_freq) // step) + 1, dtype=SIGNAL_DTYPE)
+    nsig = 0
     current_freq = start_freq
-    samples_per_scan = int(SCAN_DWELL_TIME * sdr.sample_rate)
+    sample_rate = sdr.sample_rate  # Does not change during the scan
+    samples_per_scan = int(SCAN_DWELL_TIME * sample_rate)
+    scan_buf = np.empty(samples_per_scan, np.complex64)
     max_height, max_width = stdscr.getmaxyx()  # Get screen dimensions
 
     # Calculate total steps for progress bar
     # total_steps = int((end_freq - start_freq) / step)
     # current_step = 0
+    signals_since_refresh = 0
+    poll_ctr = 0
+    next_status = 0.0
 
     while current_freq <= end_freq:
         try:
-            # Update scanning status display
-            draw_scanning_status(stdscr, current_freq, start_freq, end_freq, sdr)
+            # Update scanning status display, at most every SCAN_STATUS_INTERVAL
+            now = time.monotonic()
+            if now >= next_status:
+                draw_scanning_status(stdscr, current_freq, start_freq, end_freq, sdr)
+                next_status = now + SCAN_STATUS_INTERVAL
 
             # Check for user interrupt ('q' to quit scanning)
-            if stdscr.getch() == ord('q'):
+            poll_ctr += 1
+            if poll_ctr % SCAN_POLL_EVERY == 0 and stdscr.getch() == ord('q'):
                 break
 
             sdr.center_freq = current_freq
-            time.sleep(0.01)  # Small delay to let SDR settle
-            samples = sdr.read_samples(samples_per_scan)
+            time.sleep(SCAN_SETTLE_SECS)  # Small delay to let SDR settle
+            sdr.read_samples_into(scan_buf[:SCAN_FLUSH_SAMPLES])  # Flush stale samples
+            samples = scan_buf[:sdr.read_samples_into(scan_buf)]
 
             if len(samples) == 0:
                 continue
 
-            # Compute power spectrum
-            spectrum = np.fft.fftshift(np.fft.fft(samples))
-            power_db = 10 * np.log10(np.abs(spectrum)**2 + 1e-10)
-            max_power = np.max(power_db)
-
-            if max_power > threshold:
-                # Estimate signal bandwidth
-                mask = power_db > threshold
-                bandwidth = np.sum(mask) * (sdr.sample_rate / len(power_db))
+            # Peak power and bandwidth above threshold
+            max_power, bandwidth, detected = analyze_chunk(samples, sample_rate, threshold)
 
+            if detected:
                 if bandwidth > MIN_SIGNAL_BANDWIDTH:
                     # Classify signal
-                    signal_type = classify_signal(samples, sdr.sample_rate, bandwidth)
+                    signal_type = classify_signal(samples, sample_rate, bandwidth)
 
-                    signals.append({
-                        'frequency': current_freq,
-                        'power': max_power,
-                        'bandwidth': bandwidth,
-                        'type': signal_type
-                    })
+                    signals[nsig] = (current_freq, max_power, bandwidth, SIGNAL_TYPE_IDS[signal_type])
+                    nsig += 1
 
                     # Show immediate detection
                     status_msg = f"Signal detected at {current_freq/1e6:.3f} MHz ({signal_type})"
                     stdscr.addstr(max_height-1, 0, " " * (max_width-1))  # Clear line
-                    stdscr.addstr(max_height-1, 0, status_msg, curses.color_pair(4))
-                    stdscr.refresh()
+                    stdscr.addstr(max_height-1, 0, status_msg, CP_OK)
+                    signals_since_refresh += 1
+                    if signals_since_refresh >= SCAN_REFRESH_EVERY:
+                        stdscr.noutrefresh()
+                        curses.doupdate()
+                        signals_since_refresh = 0
 
         except Exception as e:
-            stdscr.addstr(max_height-1, 0, f"Error: {str(e)}", curses.color_pair(3))
+            stdscr.addstr(max_height-1, 0, f"Error: {str(e)}", CP_ERR)
             stdscr.refresh()
             time.sleep(0.5)
 
         current_freq += step
         # current_step += 1
 
-    # Remove duplicates and sort by frequency
-    unique_signals = []
-    seen_freqs = set()
-    for asignal in sorted(signals, key=lambda x: x['frequency']):
-        rounded_freq = round(asignal['frequency'] / 100e3) * 100e3
-        if rounded_freq not in seen_freqs:
-            seen_freqs.add(rounded_freq)
-            unique_signals.append(asignal)
+    stdscr.noutrefresh()
+    curses.doupdate()
 
-    return unique_signals
+    # Remove duplicates and sort by frequency, keeping the first signal of every 100 kHz slot
+    signals = signals[:nsig]
+    signals = signals[np.argsort(signals['frequency'], kind='stable')]
+    _, first = np.unique(np.round(signals['frequency'] / 100e3), return_index=True)
+    return signals[first]
+
+
+def analyze_scan_step(samples, sample_rate, threshold):
+    """Find and classify the signals in the part of a chunk covered by one scan step
+
+    Returns (offset, power, bandwidth, type id) tuples, offsets relative to the tuned frequency.
+    """
+    offsets, powers, bandwidths = find_chunk_signals(
+        samples, sample_rate, threshold, MIN_SIGNAL_BANDWIDTH, SCAN_STEP)
+
+    hits = []
+    for offset, peak_power, signal_bandwidth in zip(offsets, powers, bandwidths):
+        # Only add if bandwidth is reasonable
+        if signal_bandwidth > MIN_SIGNAL_BANDWIDTH:
+            signal_type = classify_signal(samples, sample_rate, signal_bandwidth)
+            hits.append((offset, peak_power, signal_bandwidth, SIGNAL_TYPE_IDS[signal_type]))
+    return hits
 
 
 def show_scanner_menu(stdscr):
@@ -1105,40 +1233,40 @@ def show_scanner_menu(stdscr):
     current_page = 0
 
     while True:
-        stdscr.clear()
+        stdscr.erase()
 
         # Draw header
         header = "Scanner Configuration - Select Band to Scan"
-        stdscr.addstr(0, 2, header, curses.color_pair(1) | curses.A_BOLD)
-        stdscr.addstr(1, 2, "-" * len(header), curses.color_pair(2))
+        stdscr.addstr(0, 2, header, CP_HL)
+        stdscr.addstr(1, 2, "-" * len(header), CP_TEXT)
 
         # Calculate slice for current page
         start_idx = current_page * entries_per_page
         end_idx = min(start_idx + entries_per_page, total_entries)
 
         # Display current page of presets
-        current_items = list(BAND_PRESETS.items())[start_idx:end_idx]
+        current_items = BAND_PRESET_ITEMS[start_idx:end_idx]
         for i, (key, (start, end, description)) in enumerate(current_items, 1):
             # Calculate absolute index for selection
             abs_index = start_idx + i
             line = f"{abs_index:2d}. {key:<8} : {description:<25} ({start/1e6:.3f}-{end/1e6:.3f} MHz)"
             try:
-                stdscr.addstr(i + 2, 2, line, curses.color_pair(2))
+                stdscr.addstr(i + 2, 2, line, CP_TEXT)
             except curses.error:
                 pass
 
         # Add custom range option
         custom_option = f"{total_entries + 1}. Custom frequency range"
         try:
-            stdscr.addstr(end_idx - start_idx + 3, 2, custom_option, curses.color_pair(4))
+            stdscr.addstr(end_idx - start_idx + 3, 2, custom_option, CP_OK)
         except curses.error:
             pass
 
         # Draw footer with navigation help
         footer = f"Page {current_page + 1}/{total_pages} | [n]ext/[p]rev page | [q]uit | Enter number to select"
         try:
-            stdscr.addstr(max_height-3, 2, footer, curses.color_pair(5))
-            stdscr.addstr(max_height-2, 2, "Choice: ", curses.color_pair(1) | curses.A_BOLD)
+            stdscr.addstr(max_height-3, 2, footer, CP_INFO)
+            stdscr.addstr(max_height-2, 2, "Choice: ", CP_HL)
         except curses.error:
             pass
 
@@ -1163,26 +1291,25 @@ def show_scanner_menu(stdscr):
                 choice_num = int(choice)
                 if 1 <= choice_num <= total_entries:
                     # Get selected band
-                    band_key = list(BAND_PRESETS.keys())[choice_num - 1]
-                    start, end, _ = BAND_PRESETS[band_key]
+                    band_key, (start, end, _) = BAND_PRESET_ITEMS[choice_num - 1]
 
                     # Get threshold
-                    stdscr.clear()
+                    stdscr.erase()
                     stdscr.addstr(0, 2, "Enter signal strength threshold \n(dB, recommended -40 to -20): ", 
-                                curses.color_pair(2))
+                                CP_TEXT)
                     threshold = float(stdscr.getstr().decode('utf-8'))
 
                     return start, end, threshold
 
                 elif choice_num == total_entries + 1:
                     # Handle custom range
-                    stdscr.clear()
-                    stdscr.addstr(0, 2, "Enter start frequency (MHz): ", curses.color_pair(2))
+                    stdscr.erase()
+                    stdscr.addstr(0, 2, "Enter start frequency (MHz): ", CP_TEXT)
                     start = float(stdscr.getstr().decode('utf-8')) * 1e6
-                    stdscr.addstr(1, 2, "Enter end frequency (MHz): ", curses.color_pair(2))
+                    stdscr.addstr(1, 2, "Enter end frequency (MHz): ", CP_TEXT)
                     end = float(stdscr.getstr().decode('utf-8')) * 1e6
                     stdscr.addstr(2, 2, "Enter signal strength threshold \n(dB, recommended -40 to -20): ", 
-                                curses.color_pair(2))
+                                CP_TEXT)
                     threshold = float(stdscr.getstr().decode('utf-8'))
 
                     return start, end, threshold
@@ -1200,6 +1327,52 @@ def show_scanner_menu(stdscr):
     return None, None, None
     
 
+def draw_scan_results_page(stdscr, signals, current_page, total_pages, results_per_page):
+    """Draw one page of scanner results with the navigation footer"""
+    max_height, max_width = stdscr.getmaxyx()
+    stdscr.erase()
+
+    # Draw header
+    header = f"Detected Signals ({len(signals)} found) - Page {current_page + 1}/{total_pages}"
+    stdscr.addstr(0, 0, header, CP_HL)
+    stdscr.addstr(1, 0, "-" * len(header), CP_TEXT)
+
+    # Calculate slice for current page
+    start_idx = current_page * results_per_page
+    end_idx = min(start_idx + results_per_page, len(signals))
+
+    # Display signals for current page
+    current_line = 2
+    for i, signal in enumerate(signals[start_idx:end_idx], start_idx + 1):
+        power_str = f"{signal['power']:.1f}".rjust(6)
+        freq_str = f"{signal['frequency']/1e6:.3f}".rjust(8)
+        bw_str = f"{signal['bandwidth']/1e3:.1f}".rjust(6)
+        signal_type = SIGNAL_TYPE_NAMES[signal['type_id']]
+        type_str = signal_type.ljust(15)
+
+        line = f"{str(i).rjust(3)}. {freq_str} MHz  Power: {power_str} dB  BW: {bw_str} kHz  Type: {type_str}"
+
+        # Color code by signal type
+        if signal_type == 'FM_BROADCAST':
+            color = CP_OK  # Green
+        elif signal_type == 'DIGITAL':
+            color = CP_INFO  # Cyan
+        elif signal_type == 'UNKNOWN':
+            color = CP_TEXT  # White
+        else:
+            color = CP_ACCENT  # Yellow
+
+        stdscr.addstr(current_line, 0, line[:max_width-1], color)
+        current_line += 1
+
+    # Draw navigation footer
+    footer = "Navigation: [n]ext page, [p]revious page, [number] to select, [q]uit"
+    stdscr.addstr(max_height-1, 0, footer, CP_TEXT)
+    stdscr.addstr(max_height-2, 0, "Enter choice: ", CP_HL)
+
+    stdscr.noutrefresh()  # The choice prompt's getstr() sends it
+
+
 def display_scan_results(stdscr, signals, threshold):
     """Display scanner results with pagination and allow selection"""
     # Ensure we're in the right mode for user input
@@ -1208,9 +1381,9 @@ def display_scan_results(stdscr, signals, threshold):
     curses.curs_set(1)     # Show cursor
 
     try:
-        if not signals:
-            stdscr.addstr(0, 0, "\nNo signals found above threshold.\n", curses.color_pair(3))
-            stdscr.addstr(2, 0, "\nPress any key to continue...", curses.color_pair(2))
+        if len(signals) == 0:
+            stdscr.addstr(0, 0, "\nNo signals found above threshold.\n", CP_ERR)
+            stdscr.addstr(2, 0, "\nPress any key to continue...", CP_TEXT)
             stdscr.getch()  # Wait for keypress
             return None
 
@@ -1218,48 +1391,17 @@ def display_scan_results(stdscr, signals, threshold):
         results_per_page = max_height - 7  # Reserve space for header and footer
         total_pages = (len(signals) + results_per_page - 1) // results_per_page
         current_page = 0
+        shown_page = None  # Page currently on screen
 
         while True:
-            stdscr.clear()
-
-            # Draw header
-            header = f"Detected Signals ({len(signals)} found) - Page {current_page + 1}/{total_pages}"
-            stdscr.addstr(0, 0, header, curses.color_pair(1) | curses.A_BOLD)
-            stdscr.addstr(1, 0, "-" * len(header), curses.color_pair(2))
-
-            # Calculate slice for current page
-            start_idx = current_page * results_per_page
-            end_idx = min(start_idx + results_per_page, len(signals))
-
-            # Display signals for current page
-            current_line = 2
-            for i, signal in enumerate(signals[start_idx:end_idx], start_idx + 1):
-                power_str = f"{signal['power']:.1f}".rjust(6)
-                freq_str = f"{signal['frequency']/1e6:.3f}".rjust(8)
-                bw_str = f"{signal['bandwidth']/1e3:.1f}".rjust(6)
-                type_str = signal['type'].ljust(15)
-
-                line = f"{str(i).rjust(3)}. {freq_str} MHz  Power: {power_str} dB  BW: {bw_str} kHz  Type: {type_str}"
-
-                # Color code by signal type
-                if signal['type'] == 'FM_BROADCAST':
-                    color = curses.color_pair(4)  # Green
-                elif signal['type'] == 'DIGITAL':
-                    color = curses.color_pair(5)  # Cyan
-                elif signal['type'] == 'UNKNOWN':
-                    color = curses.color_pair(2)  # White
-                else:
-                    color = curses.color_pair(1)  # Yellow
-
-                stdscr.addstr(current_line, 0, line[:max_width-1], color)
-                current_line += 1
-
-            # Draw navigation footer
-            footer = "Navigation: [n]ext page, [p]revious page, [number] to select, [q]uit"
-            stdscr.addstr(max_height-1, 0, footer, curses.color_pair(2))
-            stdscr.addstr(max_height-2, 0, "Enter choice: ", curses.color_pair(1) | curses.A_BOLD)
-
-            stdscr.refresh()
+            if current_page == shown_page:
+                # Same page as before, only the typed choice needs clearing
+                stdscr.move(max_height-2, 0)
+                stdscr.clrtoeol()
+                stdscr.addstr(max_height-2, 0, "Enter choice: ", CP_HL)
+            else:
+                draw_scan_results_page(stdscr, signals, current_page, total_pages, results_per_page)
+                shown_page = current_page
 
             # Get user input
             try:
@@ -1284,7 +1426,7 @@ def display_scan_results(stdscr, signals, threshold):
     except Exception as e:
         # Debug output for unexpected errors
         stdscr.addstr(max_height-1, 0, f"Display error ({type(e).__name__}): {str(e)}", 
-                     curses.color_pair(3))
+                     CP_ERR)
         stdscr.refresh()
         stdscr.getch()  # Wait for key press to see error
 
@@ -1293,7 +1435,7 @@ def display_scan_results(stdscr, signals, threshold):
         stdscr.nodelay(True)
         curses.noecho()
         curses.curs_set(0)
-        stdscr.clear()
+        stdscr.erase()
 
     return None
     
@@ -1328,17 +1470,70 @@ def draw_scanning_status(stdscr, current_freq, start_freq, end_freq, sdr):
         start_pos = max(0, (max_width - total_length) // 2)
 
         # Draw the components with colors
-        stdscr.addstr(0, start_pos, status_text, curses.color_pair(1) | curses.A_BOLD)
-        stdscr.addstr(1, start_pos, progress_bar, curses.color_pair(2))
-        stdscr.addstr(1, start_pos + len(progress_bar), percentage, curses.color_pair(4))
+        stdscr.addstr(0, start_pos, status_text, CP_HL)
+        stdscr.addstr(1, start_pos, progress_bar, CP_TEXT)
+        stdscr.addstr(1, start_pos + len(progress_bar), percentage, CP_OK)
 
         # Force screen update
-        stdscr.refresh()
+        stdscr.noutrefresh()
+        curses.doupdate()
 
     except curses.error:
         pass  # Ignore curses errors
 
 
+def resample_rows(rows, width):
+    """Linearly resample every row of a 2D array to width points, same result as np.interp per row"""
+    num_bins = rows.shape[1]
+    key = (num_bins, width)
+    if key not in RESAMPLE_CACHE:
+        points = np.linspace(0, num_bins - 1, width)
+        lo = np.minimum(points.astype(np.intp), num_bins - 1)
+        hi = np.minimum(lo + 1, num_bins - 1)
+        RESAMPLE_CACHE[key] = (lo, hi, points - lo)
+    lo, hi, frac = RESAMPLE_CACHE[key]
+
+    rows = rows.astype(np.float64, copy=False)
+    left = rows[:, lo]
+    right = rows[:, hi]
+    with np.errstate(invalid='ignore'):
+        slope = right - left
+        resampled = slope * frac + left
+        # Like np.interp, retry from the right neighbour when a non-finite one gives NaN
+        retry = np.isnan(resampled)
+        if retry.any():
+            resampled[retry] = (slope * (frac - 1) + right)[retry]
+            flat = np.isnan(resampled) & (left == right)
+            resampled[flat] = left[flat]
+    # Points that hit a bin exactly take its value as is
+    return np.where(frac == 0, left, resampled)
+
+
+def normalize_levels(data, min_val, value_range):
+    """Map data to 0..1 over [min_val, min_val + value_range], returns (levels, finite)
+
+    Non-finite values get level 0 and are flagged False in finite, so callers
+    can skip them without NaN/inf reaching an int cast.
+    """
+    finite = np.isfinite(data)
+    return np.where(finite, (data - min_val) / value_range, 0), finite
+
+
+def draw_color_runs(stdscr, y, x_offset, chars, color_index, first_pair=10):
+    """Draw a row of ASCII codes with one addstr per run of equal color, cells with a negative color index are skipped"""
+    bounds = np.flatnonzero(color_index[1:] != color_index[:-1]) + 1
+    starts = np.concatenate(([0], bounds)).tolist()
+    ends = np.concatenate((bounds, [len(color_index)])).tolist()
+    for start, end in zip(starts, ends):
+        color = int(color_index[start])
+        if color < 0:
+            continue
+        try:
+            stdscr.addstr(y, x_offset + start, chars[start:end].tobytes(), PAIR_ATTRS[first_pair + color])
+        except curses.error:
+            pass
+
+
 def draw_waterfall(stdscr, freq_data, frequencies, center_freq, bandwidth, gain, step, 
                   sdr, is_recording=False, recording_duration=None):
     """Draw the waterfall display using ASCII characters"""
@@ -1347,15 +1542,9 @@ def draw_waterfall(stdscr, freq_data, frequencies, center_freq, bandwidth, gain,
     display_width = max_width - 8
     display_height = max_height - 4
 
-    # Add current data to history
+    # Add current data to history, all data is normalized together for consistent coloring
     WATERFALL_HISTORY.append(freq_data)
-    if len(WATERFALL_HISTORY) > WATERFALL_MAX_LINES:
-        WATERFALL_HISTORY.pop(0)
-
-    # Normalize all data for consistent coloring
-    all_data = np.array(WATERFALL_HISTORY)
-    min_val = np.min(all_data[np.isfinite(all_data)])
-    max_val = np.max(all_data[np.isfinite(all_data)])
+    min_val, max_val = WATERFALL_HISTORY.value_range()
 
     # Draw dB scale on the left
     for i in range(display_height):
@@ -1363,44 +1552,23 @@ def draw_waterfall(stdscr, freq_data, frequencies, center_freq, bandwidth, gain,
         if i % 3 == 0:  # Show scale every 3 lines
             db_label = f"{db_value:4.0f}dB"
             try:
-                stdscr.addstr(i + 2, 0, db_label, curses.color_pair(2))
+                stdscr.addstr(i + 2, 0, db_label, CP_TEXT)
                 # Add scale markers
-                stdscr.addstr(i + 2, 8, "|", curses.color_pair(2))
+                stdscr.addstr(i + 2, 8, "|", CP_TEXT)
             except curses.error:
                 pass
 
-    # Draw each line of the waterfall
-    for y, line_data in enumerate(reversed(WATERFALL_HISTORY)):
-        if y >= display_height:
-            break
+    # Resample the visible lines, newest first, to fit screen width; the last column falls off the screen
+    resampled = resample_rows(WATERFALL_HISTORY.latest(display_height), display_width)[:, :max_width - 9]
 
-        # Resample data to fit screen width
-        resampled = np.interp(
-            np.linspace(0, len(line_data) - 1, display_width),
-            np.arange(len(line_data)),
-            line_data
-        )
-
-        # Draw each point in the line using ASCII characters
-        for x, value in enumerate(resampled):
-            if np.isfinite(value):
-                # Normalize value and select ASCII character and color
-                norm_value = (value - min_val) / (max_val - min_val)
-                color_index = int(norm_value * 5)  # 0-5 for the 6 color pairs
-
-                if norm_value > 0.75:
-                    char = "#"
-                elif norm_value > 0.5:
-                    char = "="
-                elif norm_value > 0.25:
-                    char = "-"
-                else:
-                    char = "."
+    # Normalize values and select ASCII character and color (0-5 for the 6 color pairs)
+    norm_values, finite = normalize_levels(resampled, min_val, max_val - min_val)
+    chars = WATERFALL_CHARS[np.searchsorted([0.25, 0.5, 0.75], norm_values)]
+    color_index = np.where(finite, (norm_values * 5).astype(int), -1)
 
-                try:
-                    stdscr.addstr(y + 3, x + 9, char, curses.color_pair(10 + color_index))
-                except curses.error:
-                    pass
+    # Draw each line of the waterfall
+    for y in range(len(resampled)):
+        draw_color_runs(stdscr, y + 3, 9, chars[y], color_index[y])
 
     # Use standardized frequency labels
     draw_frequency_labels(stdscr, center_freq, bandwidth, display_height, display_width)
@@ -1429,7 +1597,7 @@ def draw_frequency_labels(stdscr, center_freq, bandwidth, display_height, displa
                 axis_line += "-"  # Same character for both sides
 
         # Draw the axis with background
-        stdscr.addstr(display_height + 2, x_offset, axis_line, curses.color_pair(2))
+        stdscr.addstr(display_height + 2, x_offset, axis_line, CP_TEXT)
 
         # Calculate frequency steps and format labels
         freq_step = bandwidth / 5
@@ -1442,33 +1610,28 @@ def draw_frequency_labels(stdscr, center_freq, bandwidth, display_height, displa
 
             try:
                 # Draw tick mark
-                stdscr.addstr(display_height + 2, pos, "|", curses.color_pair(2))
+                stdscr.addstr(display_height + 2, pos, "|", CP_TEXT)
 
                 # Center the label under the tick mark
                 label_pos = max(pos - len(label)//2, x_offset)
-                stdscr.addstr(display_height + 3, label_pos, label, curses.color_pair(2))
+                stdscr.addstr(display_height + 3, label_pos, label, CP_TEXT)
             except curses.error:
                 pass
 
-        # Add band name indicator if frequency is in a known band
-        current_band = None
-        # Add small tolerance for floating point comparison (1 kHz)
-        tolerance = 1e3
-        for band, (start, end, description) in BAND_PRESETS.items():
-            if (start - tolerance) <= center_freq <= (end + tolerance):
-                current_band = band
-                break
+        # Add band name indicator if frequency is in a known band,
+        # with a small tolerance for floating point comparison (1 kHz)
+        current_band = band_at(center_freq, tolerance=1e3)
 
         if current_band:
             try:
                 band_text = f"[{current_band}]"
                 # Position the band name at the start of the axis
                 stdscr.addstr(display_height + 2, x_offset - len(band_text) - 1, 
-                            band_text, curses.color_pair(4) | curses.A_BOLD)
+                            band_text, CP_OK | curses.A_BOLD)
 
                 # Debug output (optional)
                 # debug_text = f"F:{center_freq/1e6:.3f}MHz B:{start/1e6:.3f}-{end/1e6:.3f}MHz"
-                # stdscr.addstr(0, 0, debug_text, curses.color_pair(2))
+                # stdscr.addstr(0, 0, debug_text, CP_TEXT)
             except curses.error:
                 pass
 
@@ -1478,18 +1641,18 @@ def draw_frequency_labels(stdscr, center_freq, bandwidth, display_height, displa
 
 def show_demod_menu(stdscr):
     """Display demodulation mode selection menu"""
-    stdscr.clear()
-    stdscr.addstr("Select Demodulation Mode:\n\n", curses.color_pair(1) | curses.A_BOLD)
+    stdscr.erase()
+    stdscr.addstr("Select Demodulation Mode:\n\n", CP_HL)
 
     for i, (mode, info) in enumerate(DEMOD_MODES.items(), 1):
         line = f"{i}. {info['name']}: {info['description']}"
         if mode == CURRENT_DEMOD:
             line += " (Current)"
-            stdscr.addstr(line + "\n", curses.color_pair(4) | curses.A_BOLD)
+            stdscr.addstr(line + "\n", CP_OK | curses.A_BOLD)
         else:
-            stdscr.addstr(line + "\n", curses.color_pair(2))
+            stdscr.addstr(line + "\n", CP_TEXT)
 
-    stdscr.addstr("\nEnter choice (or any other key to cancel): ", curses.color_pair(1) | curses.A_BOLD)
+    stdscr.addstr("\nEnter choice (or any other key to cancel): ", CP_HL)
 
     curses.echo()
     curses.curs_set(1)
@@ -1519,12 +1682,7 @@ def draw_persistence(stdscr, freq_data, frequencies, center_freq, bandwidth, gai
 
     # Add current data to history
     PERSISTENCE_HISTORY.append(freq_data)
-    if len(PERSISTENCE_HISTORY) > PERSISTENCE_LENGTH:
-        PERSISTENCE_HISTORY.pop(0)
-
-    all_data = np.array(PERSISTENCE_HISTORY)
-    min_val = np.min(all_data[np.isfinite(all_data)])
-    max_val = np.max(all_data[np.isfinite(all_data)])
+    min_val, max_val = PERSISTENCE_HISTORY.value_range()
     db_range = max_val - min_val
     if db_range == 0:
         db_range = 1
@@ -1535,30 +1693,26 @@ def draw_persistence(stdscr, freq_data, frequencies, center_freq, bandwidth, gai
         if i % 3 == 0:  # Show scale every 3 lines
             db_label = f"{db_value:4.0f}dB"
             try:
-                stdscr.addstr(i + 2, 0, db_label, curses.color_pair(2))
+                stdscr.addstr(i + 2, 0, db_label, CP_TEXT)
             except curses.error:
                 pass
 
     # Draw each trace with ASCII characters
-    for i, historical_data in enumerate(PERSISTENCE_HISTORY):
+    for i, resampled in enumerate(resample_rows(PERSISTENCE_HISTORY.lines(), display_width)):
         alpha = PERSISTENCE_ALPHA ** (PERSISTENCE_LENGTH - i)
         color_pair = int(1 + (5 * (1 - alpha)))
 
-        resampled = np.interp(
-            np.linspace(0, len(historical_data) - 1, display_width),
-            np.arange(len(historical_data)),
-            historical_data
-        )
-
-        for x, value in enumerate(resampled):
-            if np.isfinite(value):
-                normalized = (value - min_val) / db_range
-                y = int((1-normalized) * (display_height-1))
-                if 0 <= y < display_height:
-                    try:
-                        stdscr.addstr(y + 2, x + 8, '*', curses.color_pair(color_pair))
-                    except curses.error:
-                        pass
+        # Trace row of every finite column, only the cells inside the display are drawn
+        normalized, finite = normalize_levels(resampled, min_val, db_range)
+        xs = np.flatnonzero(finite)
+        ys = ((1 - normalized[xs]) * (display_height - 1)).astype(int)
+        in_view = (ys >= 0) & (ys < display_height)
+        attr = PAIR_ATTRS[color_pair]
+        for x, y in zip(xs[in_view].tolist(), ys[in_view].tolist()):
+            try:
+                stdscr.addstr(y + 2, x + 8, '*', attr)
+            except curses.error:
+                pass
 
     # Use standardized frequency labels
     draw_frequency_labels(stdscr, center_freq, bandwidth, display_height, display_width)
@@ -1586,21 +1740,29 @@ def draw_surface_plot(stdscr, freq_data, frequencies, center_freq, bandwidth, ga
         normalized_data
     )
 
-    # Draw surface with ASCII characters
+    # Project every (column, level) point of the surface to the screen, column by column
     angle_rad = np.radians(SURFACE_ANGLE)
-    for x, value in enumerate(resampled):
-        if np.isfinite(value):
-            magnitude = int(value * 20)  # Scale magnitude for visibility
-            for y in range(magnitude):
-                screen_x = int(x - y * np.cos(angle_rad)) + 8
-                screen_y = int(max_height - 2 - y * np.sin(angle_rad))
-
-                if 0 <= screen_x < max_width and 2 <= screen_y < max_height - 1:
-                    try:
-                        stdscr.addstr(screen_y, screen_x, '#',
-                                    curses.color_pair(1 + (y % 5)))
-                    except curses.error:
-                        pass
+    cos_a, sin_a = np.cos(angle_rad), np.sin(angle_rad)
+    finite = np.isfinite(resampled)
+    magnitudes = (np.where(finite, resampled, 0) * 20).astype(int)  # Scale magnitude for visibility
+    xs = np.arange(len(resampled))[:, None]
+    levels = np.arange(max(magnitudes.max(), 0))[None, :]
+    screen_x = (xs - levels * cos_a).astype(int) + 8
+    screen_y = (max_height - 2 - levels * sin_a).astype(int)
+    points = ((levels < magnitudes[:, None]) & (screen_x >= 0) & (screen_x < max_width)
+              & (screen_y >= 2) & (screen_y < max_height - 1))
+    cells = (screen_y * max_width + screen_x)[points]
+    colors = np.broadcast_to(levels % 5, points.shape)[points]
+
+    # Where points overlap the last one drawn wins, as when plotting them one by one
+    cells, last = np.unique(cells[::-1], return_index=True)
+    color_grid = np.full((max_height, max_width), -1)
+    color_grid.flat[cells] = colors[::-1][last]
+
+    # Draw surface with ASCII characters, one addstr per run of equal color
+    chars = np.full(max_width, ord('#'), dtype=np.uint8)
+    for y in np.unique(cells // max_width).tolist():
+        draw_color_runs(stdscr, y, 0, chars, color_grid[y], first_pair=1)
 
     # Use standardized frequency labels
     draw_frequency_labels(stdscr, center_freq, bandwidth, display_height, display_width)
@@ -1611,7 +1773,7 @@ def draw_surface_plot(stdscr, freq_data, frequencies, center_freq, bandwidth, ga
         if i % 3 == 0:  # Show scale every 3 lines
             db_label = f"{db_value:4.0f}dB"
             try:
-                stdscr.addstr(i + 2, 0, db_label, curses.color_pair(2))
+                stdscr.addstr(i + 2, 0, db_label, CP_TEXT)
             except curses.error:
                 pass
 
@@ -1645,15 +1807,9 @@ def draw_gradient_waterfall(stdscr, freq_data, frequencies, center_freq, bandwid
     display_width = max_width - 10
     display_height = max_height - 4
 
-    # Add current data to history
+    # Add current data to history and normalize it
     WATERFALL_HISTORY.append(freq_data)
-    if len(WATERFALL_HISTORY) > WATERFALL_MAX_LINES:
-        WATERFALL_HISTORY.pop(0)
-
-    # Normalize data
-    all_data = np.array(WATERFALL_HISTORY)
-    min_val = np.min(all_data[np.isfinite(all_data)])
-    max_val = np.max(all_data[np.isfinite(all_data)])
+    min_val, max_val = WATERFALL_HISTORY.value_range()
     db_range = max_val - min_val
     if db_range == 0:
         db_range = 1
@@ -1664,42 +1820,26 @@ def draw_gradient_waterfall(stdscr, freq_data, frequencies, center_freq, bandwid
         if i % 3 == 0:  # Show scale every 3 lines
             db_label = f"{db_value:4.0f}dB"
             try:
-                stdscr.addstr(i + 2, 0, db_label, curses.color_pair(2))
+                stdscr.addstr(i + 2, 0, db_label, CP_TEXT)
                 # Add scale markers
-                stdscr.addstr(i + 2, 8, "|", curses.color_pair(2))
+                stdscr.addstr(i + 2, 8, "|", CP_TEXT)
             except curses.error:
                 pass
 
-    # Define ASCII intensity characters (from darkest to brightest)
-    intensity_chars = ' ._-=+*#@'  # 9 levels of intensity
-
-    # Draw each line with ASCII characters
-    for y, line_data in enumerate(reversed(WATERFALL_HISTORY)):
-        if y >= display_height:
-            break
-
-        # Resample data to fit display width
-        resampled = np.interp(
-            np.linspace(0, len(line_data) - 1, display_width),
-            np.arange(len(line_data)), line_data)
-
-        for x, value in enumerate(resampled):
-            if np.isfinite(value):
-                # Normalize value between 0 and 1
-                normalized = (value - min_val) / db_range
+    # ASCII intensity characters (from darkest to brightest)
+    intensity_chars = GRADIENT_CHARS.tobytes().decode()
 
-                # Convert normalized value to character index
-                char_index = int(normalized * (len(intensity_chars) - 1))
-                char = intensity_chars[char_index]
+    # Resample the visible lines, newest first, to fit display width
+    resampled = resample_rows(WATERFALL_HISTORY.latest(display_height), display_width)
 
-                # Select color based on intensity
-                color_index = int(normalized * 5)  # 6 color pairs (0-5)
+    # Normalize values between 0 and 1, then pick character and color (6 color pairs, 0-5)
+    normalized, finite = normalize_levels(resampled, min_val, db_range)
+    chars = GRADIENT_CHARS[(normalized * (len(GRADIENT_CHARS) - 1)).astype(int)]
+    color_index = np.where(finite, (normalized * 5).astype(int), -1)
 
-                try:
-                    stdscr.addstr(y + 2, x + 9, char, 
-                                curses.color_pair(10 + color_index))
-                except curses.error:
-                    pass
+    # Draw each line with ASCII characters
+    for y in range(len(resampled)):
+        draw_color_runs(stdscr, y + 2, 9, chars[y], color_index[y])
 
     # Draw intensity scale on the right
     for i in range(display_height):
@@ -1708,7 +1848,7 @@ def draw_gradient_waterfall(stdscr, freq_data, frequencies, center_freq, bandwid
         try:
             stdscr.addstr(i + 2, max_width - 2, 
                          intensity_chars[char_index] * 2, 
-                         curses.color_pair(10 + int(normalized * 5)))
+                         PAIR_ATTRS[10 + int(normalized * 5)])
         except curses.error:
             pass
 
@@ -1740,16 +1880,17 @@ def draw_vector_display(stdscr, samples, center_freq, bandwidth, gain, step, sdr
         except curses.error:
             pass
 
-    # Plot I/Q samples with ASCII dot
-    for i, q in zip(np.real(samples), np.imag(samples)):
-        x = int(center_x + i * scale)
-        y = int(center_y - q * scale)
-
-        if 0 <= x < max_width and 0 <= y < max_height:
-            try:
-                stdscr.addstr(y, x, '.', curses.color_pair(1))
-            except curses.error:
-                pass
+    # Plot I/Q samples with ASCII dot, once per screen cell that any sample lands on
+    finite = np.isfinite(samples)
+    xs = (center_x + samples.real[finite] * scale).astype(int)
+    ys = (center_y - samples.imag[finite] * scale).astype(int)
+    on_screen = (xs >= 0) & (xs < max_width) & (ys >= 0) & (ys < max_height)
+    cells = np.unique(ys[on_screen] * max_width + xs[on_screen])
+    for y, x in zip((cells // max_width).tolist(), (cells % max_width).tolist()):
+        try:
+            stdscr.addstr(y, x, '.', CP_ACCENT)
+        except curses.error:
+            pass
 
     # Use standardized frequency labels
     draw_frequency_labels(stdscr, center_freq, bandwidth, display_height, display_width)
@@ -1767,6 +1908,7 @@ class SDRDevice:
         self.ppm = DEFAULT_PPM
         self.stdscr = stdscr
         self._valid_gains = None
+        self._applied_gain = None  # Last gain written to the device
 
     def enumerate_devices(self):
         """List all available SDR devices"""
@@ -1804,7 +1946,7 @@ class SDRDevice:
             if len(devices) == 1:
                 # If only one device, use it automatically
                 self.stdscr.addstr(0, 0, "Found single SDR device, using it automatically...", 
-                                 curses.color_pair(4))
+                                 CP_OK)
                 self.stdscr.refresh()
                 time.sleep(1)
                 return devices[0][2]
@@ -1817,13 +1959,13 @@ class SDRDevice:
 
             # Display device selection menu
             self.stdscr.clear()
-            self.stdscr.addstr(0, 0, "Available SDR Devices:", curses.color_pair(1) | curses.A_BOLD)
-            self.stdscr.addstr(1, 0, "-" * 50, curses.color_pair(2))
+            self.stdscr.addstr(0, 0, "Available SDR Devices:", CP_HL)
+            self.stdscr.addstr(1, 0, "-" * 50, CP_TEXT)
 
             for idx, name, _ in devices:
-                self.stdscr.addstr(idx + 1, 0, f"{idx}. {name}", curses.color_pair(2))
+                self.stdscr.addstr(idx + 1, 0, f"{idx}. {name}", CP_TEXT)
 
-            self.stdscr.addstr(len(devices) + 3, 0, "Select device (1-{}): ".format(len(devices)), curses.color_pair(1) | curses.A_BOLD)
+            self.stdscr.addstr(len(devices) + 3, 0, "Select device (1-{}): ".format(len(devices)), CP_HL)
 
             # Get user input
             curses.echo()
@@ -1839,7 +1981,7 @@ class SDRDevice:
                         raise ValueError
                 except ValueError:
                     self.stdscr.addstr(len(devices) + 4, 0, "Invalid choice. Try again: ", 
-                                     curses.color_pair(3))
+                                     CP_ERR)
                     self.stdscr.refresh()
 
         finally:
@@ -1856,6 +1998,7 @@ class SDRDevice:
 
             # Create device instance with selected device
             self.device = SoapySDR.Device(args)
+            self._applied_gain = None
 
             # Set initial parameters BEFORE creating the stream
             self.set_sample_rate(self.sample_rate)
@@ -1884,11 +2027,16 @@ class SDRDevice:
 
     def read_samples(self, num_samples):
         """Read samples from the SDR device"""
-        buff = np.array([0]*num_samples, np.complex64)
+        buff = np.zeros(num_samples, np.complex64)
+        self.read_samples_into(buff)
+        return buff
+
+    def read_samples_into(self, buff):
+        """Read samples into a preallocated complex64 buffer, returns the number read"""
         ret = self.device.readStream(self.stream, [buff], len(buff))
         if ret.ret < 0:
             raise RuntimeError(f"Stream error: {ret.ret}")
-        return buff
+        return ret.ret
 
     def close(self):
         if self.device:
@@ -1902,11 +2050,14 @@ class SDRDevice:
 
     def set_gain(self, gain):
         """Set the gain value"""
-        if gain == 'auto':
-            self.device.setGainMode(SOAPY_SDR_RX, 0, True)
-        else:
-            self.device.setGainMode(SOAPY_SDR_RX, 0, False)
-            self.device.setGain(SOAPY_SDR_RX, 0, float(gain))
+        # Each write is a control transfer on USB devices, skip it if nothing changes
+        if gain != self._applied_gain:
+            if gain == 'auto':
+                self.device.setGainMode(SOAPY_SDR_RX, 0, True)
+            else:
+                self.device.setGainMode(SOAPY_SDR_RX, 0, False)
+                self.device.setGain(SOAPY_SDR_RX, 0, float(gain))
+            self._applied_gain = gain
         self.gain = gain
 
     def set_center_freq(self, freq):
@@ -1931,7 +2082,7 @@ class SDRDevice:
         except Exception as e:
             if self.stdscr:
                 self.stdscr.addstr(0, 0, f"PPM correction not supported: {str(e)}",
-                             curses.color_pair(3) | curses.A_BOLD)
+                             CP_ERR | curses.A_BOLD)
                 self.stdscr.refresh()
                 time.sleep(1)
         return False
@@ -1961,8 +2112,8 @@ def show_rtl_commands(stdscr, sdr):
 
         # Draw header
         header = "Available RTL Commands"
-        stdscr.addstr(0, 2, header, curses.color_pair(1) | curses.A_BOLD)
-        stdscr.addstr(1, 2, "-" * len(header), curses.color_pair(2))
+        stdscr.addstr(0, 2, header, CP_HL)
+        stdscr.addstr(1, 2, "-" * len(header), CP_TEXT)
 
         # Calculate slice for current page
         start_idx = current_page * entries_per_page
@@ -1991,19 +2142,19 @@ def show_rtl_commands(stdscr, sdr):
             try:
                 # Display name in bold white
                 name_line = f"{abs_index:2d}. {name}"
-                stdscr.addstr(display_line, 2, name_line, curses.color_pair(1) | curses.A_BOLD)
+                stdscr.addstr(display_line, 2, name_line, CP_HL)
 
                 # Display command in cyan on next line
                 cmd_line = f"    {formatted_command}"
-                stdscr.addstr(display_line + 1, 2, cmd_line, curses.color_pair(5))
+                stdscr.addstr(display_line + 1, 2, cmd_line, CP_INFO)
             except curses.error:
                 pass
 
         # Draw footer with navigation help
         footer = f"Page {current_page + 1}/{total_pages} | [n]ext/[p]rev page | [q]uit | Enter number to select"
         try:
-            stdscr.addstr(max_height-2, 2, footer, curses.color_pair(5))
-            stdscr.addstr(max_height-1, 2, "Choice: ", curses.color_pair(1) | curses.A_BOLD)
+            stdscr.addstr(max_height-2, 2, footer, CP_INFO)
+            stdscr.addstr(max_height-1, 2, "Choice: ", CP_HL)
         except curses.error:
             pass
 
@@ -2051,6 +2202,17 @@ def show_rtl_commands(stdscr, sdr):
             curses.curs_set(0)
 
 
+# Draw function of every display mode that plots freq_data, all take the same arguments.
+# VECTOR plots the raw samples instead and is called separately.
+SPECTRUM_DISPLAYS = {
+    'SPECTRUM': draw_spectrogram,
+    'WATERFALL': draw_waterfall,
+    'PERSISTENCE': draw_persistence,
+    'SURFACE': draw_surface_plot,
+    'GRADIENT': draw_gradient_waterfall,
+}
+
+
 def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
     global SCAN_ACTIVE, AGC_ENABLED, last_agc_update, SAMPLES, WATERFALL_MODE
     global CURRENT_DEMOD,USE_PIPE,PIPE_FILE, CURRENT_MODE
@@ -2078,12 +2240,12 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
 
     def draw_mr_mode(stdscr, sdr):
         nonlocal channels, mr_search_query, current_band, current_band_index, bands, mr_selected_key
-        stdscr.clear()
+        stdscr.erase()
         #channels.clear()
         band_name = bands[current_band_index]
         current_band = MR_BANDS[band_name]
 
-        stdscr.addstr(0, 2, f"Category: {band_name}", curses.color_pair(1) | curses.A_BOLD)
+        stdscr.addstr(0, 2, f"Category: {band_name}", CP_HL)
 
         # --- Filtering logic ---
         if band_name == "BOOKMARKS":
@@ -2111,9 +2273,9 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
 
         # --- Handle empty list ---
         if band_name == "BOOKMARKS" and not channels:
-            stdscr.addstr(3, 4, "No bookmarks found.", curses.color_pair(3))
+            stdscr.addstr(3, 4, "No bookmarks found.", CP_ERR)
         elif band_name != "BOOKMARKS" and not channels:
-            stdscr.addstr(3, 4, "No matching channels found.", curses.color_pair(3))
+            stdscr.addstr(3, 4, "No matching channels found.", CP_ERR)
         else:
             start_index = mr_scroll_offset
             end_index = min(len(channels), mr_scroll_offset + mr_visible_lines + 1)
@@ -2131,12 +2293,12 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
                 if y >= max_height - 2:
                     break
 
-                # color = curses.color_pair(4) | curses.A_BOLD if i == mr_selected_index else curses.color_pair(2)
+                # color = CP_OK | curses.A_BOLD if i == mr_selected_index else CP_TEXT
                 if i == mr_selected_index:
-                    color = curses.color_pair(4) | curses.A_BOLD
+                    color = CP_OK | curses.A_BOLD
                     mr_selected_key = name
                 else:
-                    color = curses.color_pair(2)
+                    color = CP_TEXT
 
                 prefix = "> " if current_freq == freq else "  "
                 stdscr.addstr(
@@ -2150,19 +2312,20 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
             search_status = f"Search: '{mr_search_query}'" if mr_search_query else ""
             info_line1 = f"Freq: {sdr.center_freq/1e6:.4f} MHz  Demod: {CURRENT_DEMOD}  PPM: {sdr.ppm}"
             info_line2 = f"v: Back  s: Filter S: Reset Filter  {search_status}"
-            stdscr.addstr(max_height - 2, 2, info_line1[:max_width - 4], curses.color_pair(5))
-            stdscr.addstr(max_height - 1, 2, info_line2[:max_width - 4], curses.color_pair(5))
+            stdscr.addstr(max_height - 2, 2, info_line1[:max_width - 4], CP_INFO)
+            stdscr.addstr(max_height - 1, 2, info_line2[:max_width - 4], CP_INFO)
         except Exception:
             pass
 
     # Initialize display mode
     current_display_mode = video_mode
+    current_mode_index = DISPLAY_MODES.index(current_display_mode)
 
     # Initialize audio
     audio_available = init_audio_device()
     if not audio_available:
         stdscr.addstr(0, 0, "Warning: Audio system initialization failed", 
-                     curses.color_pair(3) | curses.A_BOLD)
+                     CP_ERR | curses.A_BOLD)
         stdscr.refresh()
         time.sleep(2)
 
@@ -2175,6 +2338,500 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
     wav_file = None
     recording_start_time = None
 
+    # Bottom line status messages are cleared by the main loop once they expire,
+    # so showing one never holds up sample reading
+    status_clear_at = 0.0
+
+    def show_status(msg, attr=CP_OK):
+        nonlocal status_clear_at
+        stdscr.move(max_height - 1, 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(max_height - 1, 0, msg[:max_width - 1], attr)
+        stdscr.noutrefresh()
+        status_clear_at = time.monotonic() + STATUS_MESSAGE_SECS
+
+    def handle_pipe_recording():
+        nonlocal recording_start_time
+        ui.draw_clearheader(stdscr)
+        # if not audio_recording and AUDIO_AVAILABLE and audio_enabled and not USE_PIPE:
+        if not USE_PIPE:
+            # Start recording
+            recording_start_time = time.time()
+            # show_popup_msg(stdscr,"Sample rate: " + str(sdr.sample_rate),pause=4)
+            start_pipe_recording(stdscr)
+        elif audio_recording:
+            # Stop recording
+            stop_pipe_recording(stdscr)
+
+    def handle_audio_toggle():  # Toggle audio
+        nonlocal audio_enabled, stream
+        if USE_PIPE:
+            show_popup_msg(stdscr,"Disable PIPE export first!",error=True)
+        else:
+            if audio_available:
+                audio_enabled = not audio_enabled
+                if audio_enabled and stream is None:
+                    try:
+                        stream = sd.OutputStream(
+                            channels=2,
+                            samplerate=DEFAULT_SAMPLE_RATE,
+                            callback=audio_callback,
+                            blocksize=DEFAULT_BLOCK_SIZE,
+                            latency=0.1,
+                            dtype=np.float32
+                        )
+                        stream.start()
+                    except sd.PortAudioError as e:
+                        show_status(f"Audio error: {str(e)}", CP_ERR | curses.A_BOLD)
+                        audio_enabled = False
+                        stream = None
+                elif not audio_enabled and stream is not None:
+                    try:
+                        stream.stop()
+                        stream.close()
+                    except:
+                        pass
+                    stream = None
+                    audio_buffer.clear()
+
+    def handle_freq_up_1m():  # Increase frequency by 1 MHz
+        sdr.set_center_freq(sdr.center_freq + 1e6)
+
+    def handle_freq_down_1m():  # Decrease frequency by 1 MHz
+        sdr.set_center_freq(max(0, sdr.center_freq - 1e6))
+
+    def handle_freq_up_05m():  # Increase frequency by 0.5 MHz
+        nonlocal ui_update_counter
+        sdr.set_center_freq(sdr.center_freq + 0.5e6)
+        ui_update_counter = 0
+
+    def handle_freq_down_05m():  # Decrease frequency by 0.5 MHz
+        nonlocal ui_update_counter
+        sdr.set_center_freq(max(0, sdr.center_freq - 0.5e6))
+        ui_update_counter = 0
+
+    def handle_set_freq():  # Set Frequency
+        nonlocal ui_update_counter
+        ui_update_counter = 0
+        freq = setfreq(stdscr)
+        if freq:
+            if freq[-1] in 'mM  ':
+                freq = float(freq[:-1]) * 1e6
+            elif freq[-1] in 'kK':
+                freq = float(freq[:-1]) * 1e3
+            sdr.set_center_freq(int(freq))
+
+    def handle_step_down():  # Decrease step
+        nonlocal freq_step
+        freq_step = max(0.01e6, freq_step - 0.01e6)
+        ui.draw_clearheader(stdscr)
+
+    def handle_step_up():  # Increase step
+        nonlocal freq_step
+        freq_step = min(sdr.sample_rate / 2, freq_step + 0.01e6)
+        ui.draw_clearheader(stdscr)
+
+    def handle_help():  # Help
+        showhelp(stdscr)
+        stdscr.clear()
+        stdscr.noutrefresh()
+
+    def handle_zoom_in():  # Zoom in (reduce bandwidth)
+        nonlocal bandwidth
+        bandwidth = max(0.1e6, bandwidth - zoom_step)
+        ui.draw_clearheader(stdscr)
+
+    def handle_squelch_up():
+        global SQUELCH
+        SQUELCH += 1
+
+    def handle_squelch_down():
+        global SQUELCH
+        SQUELCH -= 1
+
+    def handle_zoom_out():  # Zoom out (increase bandwidth)
+        nonlocal bandwidth
+        bandwidth = min(sdr.sample_rate, bandwidth + zoom_step)
+        ui.draw_clearheader(stdscr)
+
+    def handle_shift_down():  # Shift center frequency down
+        sdr.set_center_freq(max(0, sdr.center_freq - freq_step))
+        ui.draw_clearheader(stdscr)
+
+    def handle_shift_up():  # Shift center frequency up
+        sdr.set_center_freq(sdr.center_freq + freq_step)
+        ui.draw_clearheader(stdscr)
+
+    def handle_samples_down():  # Decrease samples
+        global SAMPLES
+        SAMPLES -= 1
+        if SAMPLES < 5:
+            SAMPLES = 5
+        ui.draw_clearheader(stdscr)
+
+    def handle_samples_up():  # Increase samples
+        global SAMPLES
+        SAMPLES += 1
+        if SAMPLES > 12:
+            SAMPLES = 12
+        ui.draw_clearheader(stdscr)
+
+    def handle_gain_up():
+        nonlocal gainindex
+        gainindex +=1
+        if gainindex <= len(sdr.valid_gains_db)-1:
+            sdr.set_gain(sdr.valid_gains_db[gainindex])
+        else:
+            sdr.set_gain("auto")
+            gainindex = -1
+        ui.draw_clearheader(stdscr)
+
+    def handle_gain_down():
+        nonlocal gainindex
+        gainindex -= 1
+        if gainindex < 0:
+            sdr.set_gain(sdr.valid_gains_db[0])
+            gainindex = 0
+        else:
+            sdr.set_gain(sdr.valid_gains_db[gainindex])
+        ui.draw_clearheader(stdscr)
+
+    def handle_save_bookmark():  # Save bookmark
+        add_bookmark(stdscr, sdr.center_freq, bandwidth)
+
+    def handle_load_bookmark():  # Load bookmark
+        global CURRENT_DEMOD
+        nonlocal bandwidth
+        bkm = show_bookmarks(stdscr)
+        if bkm is not None:
+            new_freq = bkm[0]
+            sdr.set_center_freq(new_freq)
+            bandwidth = bkm[2]
+            CURRENT_DEMOD = bkm[1]
+
+    def handle_audio_recording():  # Start/Stop recording
+        nonlocal audio_recording, wav_file, recording_start_time
+        ui.draw_clearheader(stdscr)
+        if not audio_recording and AUDIO_AVAILABLE and audio_enabled:
+            # Start recording
+            timestamp = time.strftime("%Y%m%d-%H%M%S")
+            filename = f"sdr_recording_{timestamp}.wav"
+            wav_file = start_audio_recording(filename)
+            audio_recording = True
+            recording_start_time = time.time()
+            stdscr.addstr(max_height-1, 0, f"Started recording to {filename}", 
+                        CP_OK)
+        elif audio_recording:
+            # Stop recording
+            stop_audio_recording(wav_file)
+            audio_recording = False
+            wav_file = None
+            stdscr.addstr(max_height-1, 0, "Recording stopped", 
+                        CP_OK)
+        else:
+            stdscr.addstr(max_height-1, 0, 
+                          "Audio must be enabled to record (press 'a' first)", 
+                          CP_ERR)
+        stdscr.noutrefresh()
+
+    def handle_save_settings():  # Save settings
+        save_settings(sdr, bandwidth, freq_step, SAMPLES, AGC_ENABLED)
+        show_status("Settings saved")
+
+    def handle_load_settings():  # Load settings
+        global SAMPLES, AGC_ENABLED
+        nonlocal bandwidth, freq_step
+        settings = load_settings()
+        sdr.set_sample_rate(settings['sample_rate'])
+        sdr.set_center_freq(settings['frequency'])
+        sdr.set_gain(settings['gain'])
+        bandwidth = settings['bandwidth']
+        freq_step = settings['freq_step']
+        SAMPLES = settings['samples']
+        AGC_ENABLED = settings['agc_enabled']
+        show_status("Settings loaded")
+
+    def handle_agc_toggle():  # Toggle AGC
+        global AGC_ENABLED
+        nonlocal gainindex
+        ui.draw_clearheader(stdscr)
+        AGC_ENABLED = not AGC_ENABLED
+        if not AGC_ENABLED:
+            # Reset to manual gain mode
+            if gainindex >= 0 and gainindex < len(sdr.valid_gains_db):
+                sdr.set_gain(sdr.valid_gains_db[gainindex])
+            else:
+                sdr.set_gain('auto')
+                gainindex = -1
+
+    def handle_band_presets():  # Band presets
+        global last_agc_update
+        nonlocal bandwidth
+        new_freq, new_bandwidth = show_band_presets(stdscr)
+        stdscr.clear()
+        if new_freq is not None:
+            sdr.set_center_freq(new_freq)
+            bandwidth = new_bandwidth
+            # Adjust gain for the new frequency range
+            if AGC_ENABLED:
+                # Force an immediate AGC update
+                last_agc_update = 0
+            show_status(f"Switched to band: {new_freq/1e6:.3f} MHz")
+
+    def handle_scan():  # Start frequency scanner
+        global SCAN_ACTIVE, LAST_SCAN_RESULTS
+        # Get scanner configuration
+        start_freq, end_freq, threshold = show_scanner_menu(stdscr)
+        if start_freq is not None:
+            SCAN_ACTIVE = True
+            sample_rate = sdr.sample_rate  # Does not change during the scan
+            # Room for one hit per step to start with, doubled whenever a step fills it
+            signals = np.empty(int((end_freq - start_freq) // SCAN_STEP) + 1, dtype=SIGNAL_DTYPE)
+            nsig = 0
+            current_freq = start_freq
+            signals_since_refresh = 0
+            poll_ctr = 0
+            next_status = 0.0
+            # Two buffers, so a step can be read while the previous one is still analysed
+            scan_bufs = (np.empty(2048, np.complex64),  # Reduced sample size for speed
+                         np.empty(2048, np.complex64))
+            buf_index = 0
+            pending_step = None  # (frequency, future) of the step being analysed
+
+            def record_step(step_freq, analysis):
+                """Store the hits of an analysed step and show them on the status line"""
+                nonlocal signals, nsig, signals_since_refresh
+                hits = analysis.result()
+                if nsig + len(hits) > len(signals):
+                    grown = np.empty(max(2 * len(signals), nsig + len(hits)), dtype=SIGNAL_DTYPE)
+                    grown[:nsig] = signals[:nsig]
+                    signals = grown
+
+                for offset, peak_power, signal_bandwidth, type_id in hits:
+                    signal_freq = step_freq + offset
+                    signals[nsig] = (signal_freq, peak_power, signal_bandwidth, type_id)
+                    nsig += 1
+
+                    # Debug output
+                    stdscr.addstr(max_height-1, 0, 
+                                f"Signal found: {signal_freq/1e6:.3f} MHz, "
+                                f"Power: {peak_power:.1f} dB, "
+                                f"BW: {signal_bandwidth/1e3:.1f} kHz", 
+                                CP_OK)
+                    signals_since_refresh += 1
+                    if signals_since_refresh >= SCAN_REFRESH_EVERY:
+                        stdscr.noutrefresh()
+                        curses.doupdate()
+                        signals_since_refresh = 0
+
+            def report_scan_error(e):
+                stdscr.addstr(max_height-1, 0, 
+                            f"Scan error ({type(e).__name__}): {str(e)}", 
+                            CP_ERR)
+                stdscr.refresh()
+
+            # Scanning loop, each step's FFT and classification run on the worker
+            # while the main thread retunes and reads the next step
+            with ThreadPoolExecutor(max_workers=1) as scan_analyzer:
+                while current_freq <= end_freq and SCAN_ACTIVE:
+                    # Update progress display, at most every SCAN_STATUS_INTERVAL
+                    now = time.monotonic()
+                    if now >= next_status:
+                        draw_scanning_status(stdscr, current_freq, start_freq, end_freq, sdr)
+                        next_status = now + SCAN_STATUS_INTERVAL
+
+                    # Check for cancel
+                    poll_ctr += 1
+                    if poll_ctr % SCAN_POLL_EVERY == 0 and stdscr.getch() == ord('q'):
+                        SCAN_ACTIVE = False
+                        break
+
+                    # Perform scan for current chunk
+                    try:
+                        scan_buf = scan_bufs[buf_index]
+                        # Set frequency and allow settling time
+                        sdr.set_center_freq(current_freq)
+                        time.sleep(SCAN_SETTLE_SECS)  # Short settling time
+                        sdr.read_samples_into(scan_buf[:SCAN_FLUSH_SAMPLES])  # Flush stale samples
+
+                        # Read samples
+                        samples = scan_buf[:sdr.read_samples_into(scan_buf)]
+
+                        # Collect the previous step, which frees its buffer for the next read
+                        if pending_step is not None:
+                            step, pending_step = pending_step, None
+                            record_step(*step)
+
+                        if len(samples) > 0:
+                            pending_step = (current_freq, scan_analyzer.submit(
+                                analyze_scan_step, samples, sample_rate, threshold))
+                            buf_index ^= 1
+
+                    except Exception as e:
+                        report_scan_error(e)
+
+                    # Move to next frequency
+                    current_freq += SCAN_STEP
+
+                # The last step read (or the one in flight when cancelled)
+                if pending_step is not None:
+                    try:
+                        record_step(*pending_step)
+                    except Exception as e:
+                        report_scan_error(e)
+
+            stdscr.noutrefresh()
+            curses.doupdate()
+
+            # After scanning, store results globally
+            signals = signals[:nsig]
+            if nsig:
+                LAST_SCAN_RESULTS = signals.copy()  # Store a copy of the results
+
+                # Display results and get selected frequency
+                new_freq = display_scan_results(stdscr, signals, threshold)
+
+            # Reset scan state
+            SCAN_ACTIVE = False
+            stdscr.clear()
+
+    def handle_demod_menu():  # Change demodulation mode
+        global CURRENT_DEMOD
+        nonlocal bandwidth
+        new_mode = show_demod_menu(stdscr)
+        if new_mode is not None:
+            CURRENT_DEMOD = new_mode
+            # Update bandwidth based on mode
+            if DEMOD_MODES[CURRENT_DEMOD]['bandwidth']:
+                bandwidth = DEMOD_MODES[CURRENT_DEMOD]['bandwidth']
+            show_status(f"Switched to {DEMOD_MODES[CURRENT_DEMOD]['name']} mode")
+
+    def handle_morse_decoder():  # Add Morse decoder option
+        show_morse_decoder(stdscr, sdr, sdr.sample_rate)
+        stdscr.clear()
+        stdscr.noutrefresh()
+
+    def handle_aprs_decoder():  # Add APRS decoder option
+        show_aprs_decoder(stdscr, sdr, sdr.sample_rate)
+        stdscr.clear()
+        stdscr.noutrefresh()
+
+    def handle_next_display_mode():  # Mode switch
+        nonlocal current_display_mode, current_mode_index
+        current_mode_index = (current_mode_index + 1) % len(DISPLAY_MODES)
+        current_display_mode = DISPLAY_MODES[current_mode_index]
+        stdscr.erase()  # Blank the buffer; the next refresh only sends changed cells
+
+    def handle_rtl_commands():  # RTL Commands
+        show_rtl_commands(stdscr, sdr)  # Pass sdr here
+
+    def handle_ppm_up():  # Increase PPM
+        ui.draw_clearheader(stdscr)
+        if sdr.ppm < 1000:  # Add reasonable limit
+            if sdr.set_ppm(sdr.ppm + 1):
+                show_status(f"PPM set to {sdr.ppm}")
+            else:
+                show_status("Failed to set PPM", CP_ERR)
+
+    def handle_ppm_down():  # Decrease PPM
+        ui.draw_clearheader(stdscr)
+        if sdr.ppm > -1000:  # Add reasonable limit
+            if sdr.set_ppm(sdr.ppm - 1):
+                show_status(f"PPM set to {sdr.ppm}")
+            else:
+                show_status("Failed to set PPM", CP_ERR)
+
+    def handle_ppm_set():  # Set exact PPM value
+        ui.draw_clearheader(stdscr)
+        stdscr.addstr(0, 0, "Enter PPM correction value: ", 
+                     CP_HL)
+        curses.echo()
+        curses.curs_set(1)
+        stdscr.nodelay(False)
+        try:
+            ppm = int(stdscr.getstr().decode('utf-8'))
+            if sdr.set_ppm(ppm):
+                show_status(f"PPM set to {sdr.ppm}")
+            else:
+                show_status("Failed to set PPM", CP_ERR)
+        except ValueError:
+            show_status("Invalid PPM value!", CP_ERR)
+        finally:
+            curses.noecho()
+            curses.curs_set(0)
+            stdscr.nodelay(True)
+
+    def handle_last_scan():  # Show last scan results
+        if len(LAST_SCAN_RESULTS):
+            stdscr.nodelay(False)
+            curses.flushinp()
+
+            # Display the stored results
+            new_freq = display_scan_results(stdscr, LAST_SCAN_RESULTS, SIGNAL_THRESHOLD)
+
+            # If frequency was selected, tune to it
+            if new_freq is not None:
+                sdr.set_center_freq(new_freq)
+
+            stdscr.nodelay(True)
+            stdscr.clear()
+        else:
+            # Show message if no previous scan results exist
+            show_status("No previous scan results available", CP_ERR)
+
+    def set_display_mode(index):  # Display mode keys 1-6
+        nonlocal current_display_mode, current_mode_index
+        current_mode_index = index
+        current_display_mode = DISPLAY_MODES[index]
+        stdscr.erase()
+
+    # VFO key bindings. 'q' and 'v' leave or restart the loop and are handled inline
+    key_handlers = {
+        ord('I'): handle_pipe_recording,
+        ord('a'): handle_audio_toggle,
+        curses.KEY_UP: handle_freq_up_1m,
+        curses.KEY_DOWN: handle_freq_down_1m,
+        curses.KEY_RIGHT: handle_freq_up_05m,
+        curses.KEY_LEFT: handle_freq_down_05m,
+        ord('x'): handle_set_freq,
+        ord('t'): handle_step_down,
+        ord('T'): handle_step_up,
+        ord('h'): handle_help,
+        ord('b'): handle_zoom_in,
+        ord(']'): handle_squelch_up,
+        ord('['): handle_squelch_down,
+        ord('B'): handle_zoom_out,
+        ord('f'): handle_shift_down,
+        ord('F'): handle_shift_up,
+        ord('s'): handle_samples_down,
+        ord('S'): handle_samples_up,
+        ord('G'): handle_gain_up,
+        ord('g'): handle_gain_down,
+        ord('k'): handle_save_bookmark,
+        ord('l'): handle_load_bookmark,
+        ord('R'): handle_audio_recording,
+        ord('w'): handle_save_settings,
+        ord('r'): handle_load_settings,
+        ord('A'): handle_agc_toggle,
+        ord('n'): handle_band_presets,
+        ord('c'): handle_scan,
+        ord('d'): handle_demod_menu,
+        ord('M'): handle_morse_decoder,
+        ord('.'): handle_aprs_decoder,
+        ord('m'): handle_next_display_mode,
+        ord('/'): handle_rtl_commands,
+        ord('P'): handle_ppm_up,
+        ord('p'): handle_ppm_down,
+        ord('O'): handle_ppm_set,
+        ord('C'): handle_last_scan,
+    }
+    # Display mode keys 1-6
+    key_handlers.update({key: (lambda index=index: set_display_mode(index))
+                         for key, index in MODE_KEYS.items()})
+
+    # Reads the next frame's samples while the current one is processed and drawn
+    sample_reader = ThreadPoolExecutor(max_workers=1)
+
     # Initialize SDR device with selected backend
     try:
         sdr = SDRDevice(stdscr=stdscr)
@@ -2210,7 +2867,7 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
                 sdr.set_ppm(settings['ppm'])
         except Exception as e:
             stdscr.addstr(0, 0, f"Warning: PPM correction not supported: {str(e)}", 
-                         curses.color_pair(3) | curses.A_BOLD)
+                         CP_ERR | curses.A_BOLD)
             stdscr.refresh()
             time.sleep(1)
             sdr.ppm = 0  # Reset to 0 if setting fails
@@ -2223,6 +2880,17 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
         # Enable non-blocking input
         stdscr.nodelay(True)
         ui_update_counter = 0
+        sample_bufs = [np.empty(0, np.complex64)] * 2  # Frame being read, frame being processed
+        pending_read = None  # Future of the background read of the next frame
+        freq_bins_key = None  # (sample_rate, center_freq) that freq_bins was computed for
+
+        def start_read(num_samples):
+            """Start reading a frame in the background, into the buffer not being processed"""
+            sample_bufs.reverse()
+            if len(sample_bufs[0]) != num_samples:
+                sample_bufs[0] = np.empty(num_samples, np.complex64)
+            buf = sample_bufs[0]
+            return sample_reader.submit(lambda: buf[:sdr.read_samples_into(buf)])
 
         while True:
             try:
@@ -2231,17 +2899,20 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
                 # Update screen dimensions in case terminal was resized
                 max_height, max_width = stdscr.getmaxyx()
 
-                # Read samples and compute FFT
+                # Read samples and compute FFT, the read is normally already started by the previous frame
                 try:
-                    samples = sdr.read_samples((2**SAMPLES) * 256)
+                    if pending_read is None:
+                        pending_read = start_read((2**SAMPLES) * 256)
+                    read, pending_read = pending_read, None
+                    samples = read.result()
                     if len(samples) == 0 or np.all(samples == 0):
                         stdscr.addstr(max_height-1, 0, "Error reading samples, retrying...", 
-                                     curses.color_pair(3))
+                                     CP_ERR)
                         stdscr.refresh()
                         time.sleep(0.1)
                         continue
                 except Exception as e:
-                    stdscr.addstr(max_height-1, 0, f"Error: {str(e)}", curses.color_pair(3))
+                    stdscr.addstr(max_height-1, 0, f"Error: {str(e)}", CP_ERR)
                     stdscr.refresh()
                     time.sleep(0.1)
                     continue
@@ -2252,6 +2923,9 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
                     gainindex = adjust_gain(sdr, current_power, gainindex)
                     last_agc_update = current_time
 
+                # Read the next frame while this one is demodulated, transformed and drawn
+                pending_read = start_read((2**SAMPLES) * 256)
+
                 # Update audio processing logic
                 if AUDIO_AVAILABLE and audio_enabled:
                     # signal_power_db = 10 * np.log10(np.mean(np.abs(samples)**2))
@@ -2267,432 +2941,71 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
                     audio = demodulate_signal(samples, sdr.sample_rate, CURRENT_DEMOD)
                     audio_buffer.append(audio)
 
-                # Calculate frequency bins
-                num_bins = 1024  # Reduced from 2048
-                freq_bins = np.fft.fftshift(np.fft.fftfreq(num_bins, d=1/sdr.sample_rate)) + sdr.center_freq
+                if CURRENT_MODE == 'VFO':
+                    ui_update_counter += 1
+                    if status_clear_at and time.monotonic() >= status_clear_at:
+                        stdscr.move(max_height - 1, 0)
+                        stdscr.clrtoeol()
+                        status_clear_at = 0.0
+                    if ui_update_counter % 3 == 0:  # The spectrum is only computed for drawn frames
+                        # Calculate frequency bins, only when the tuning changed
+                        if freq_bins_key != (sdr.sample_rate, sdr.center_freq):
+                            freq_bins_key = (sdr.sample_rate, sdr.center_freq)
+                            num_bins = 1024  # Reduced from 2048
+                            freq_bins = np.fft.fftshift(np.fft.fftfreq(num_bins, d=1/sdr.sample_rate)) + sdr.center_freq
 
-                # Compute FFT with improved processing
-                freq_data = compute_fft(samples)
+                        # Compute FFT with improved processing
+                        freq_data = compute_fft(samples)
 
-                # Apply moving average smoothing
-                window_size = 5
-                freq_data = np.convolve(freq_data, np.ones(window_size)/window_size, mode='valid')
+                        # Apply moving average smoothing
+                        window_size = 5
+                        freq_data = np.convolve(freq_data, np.full(window_size, 1 / window_size, dtype=np.float32), mode='valid')
 
-                # Apply additional noise reduction
-                noise_threshold = np.median(freq_data) - 10
-                freq_data[freq_data < noise_threshold] = noise_threshold
+                        # Apply additional noise reduction
+                        noise_threshold = np.median(freq_data) - 10
+                        freq_data[freq_data < noise_threshold] = noise_threshold
 
-                # Update the draw_spectrogram call to include recording status
-                recording_duration = time.time() - recording_start_time if audio_recording else None
+                        # Update the draw_spectrogram call to include recording status
+                        recording_duration = time.time() - recording_start_time if audio_recording else None
 
-                if CURRENT_MODE == 'VFO':
-                    ui_update_counter += 1
-                    if ui_update_counter % 3 == 0:
                         draw_header(stdscr, freq_data, freq_bins, sdr.center_freq, bandwidth, sdr.gain, freq_step, sdr, audio_recording, recording_duration)
 
-                        if current_display_mode == 'SPECTRUM':
-                            draw_spectrogram(stdscr, freq_data, freq_bins, sdr.center_freq, 
-                                           bandwidth, sdr.gain, freq_step, sdr,  # Add sdr here
-                                           audio_recording, recording_duration)
-                        elif current_display_mode == 'WATERFALL':
-                            draw_waterfall(stdscr, freq_data, freq_bins, sdr.center_freq, 
-                                         bandwidth, sdr.gain, freq_step, sdr,  # Add sdr here
+                        draw_display = SPECTRUM_DISPLAYS.get(current_display_mode)
+                        if draw_display:
+                            draw_display(stdscr, freq_data, freq_bins, sdr.center_freq,
+                                         bandwidth, sdr.gain, freq_step, sdr,
                                          audio_recording, recording_duration)
-                        elif current_display_mode == 'PERSISTENCE':
-                            draw_persistence(stdscr, freq_data, freq_bins, sdr.center_freq,
-                                           bandwidth, sdr.gain, freq_step, sdr,  # Add sdr here
-                                           audio_recording, recording_duration)
-                        elif current_display_mode == 'SURFACE':
-                            draw_surface_plot(stdscr, freq_data, freq_bins, sdr.center_freq,
-                                          bandwidth, sdr.gain, freq_step, sdr,  # Add sdr here
-                                          audio_recording, recording_duration)
-                        elif current_display_mode == 'GRADIENT':
-                            draw_gradient_waterfall(stdscr, freq_data, freq_bins, sdr.center_freq,
-                                                   bandwidth, sdr.gain, freq_step, sdr,
-                                                   audio_recording, recording_duration)
                         elif current_display_mode == 'VECTOR':
                             draw_vector_display(stdscr, samples, sdr.center_freq,
                                            bandwidth, sdr.gain, freq_step, sdr)
 
+                        # Push the whole frame to the terminal in one update
+                        stdscr.noutrefresh()
+                        curses.doupdate()
+
                 # Handle user input
                 key = stdscr.getch()
+                if key != -1:
+                    # Whatever the key does may draw over the spectrum rows
+                    SPECTRUM_ROWS['chars'] = None
+                if key != -1 and pending_read is not None:
+                    # Key handlers may retune or reconfigure the device, so let the read finish
+                    # first and drop it, the next frame then reads with the new settings
+                    pending_read.exception()
+                    pending_read = None
                 if CURRENT_MODE == "VFO":
                     if key == ord('q'):  # Quit
                         break
-                    elif key == ord('I'):
-                        ui.draw_clearheader(stdscr)
-                        # if not audio_recording and AUDIO_AVAILABLE and audio_enabled and not USE_PIPE:
-                        if not USE_PIPE:
-                            # Start recording
-                            recording_start_time = time.time()
-                            # show_popup_msg(stdscr,"Sample rate: " + str(sdr.sample_rate),pause=4)
-                            start_pipe_recording(stdscr)
-                        elif audio_recording:
-                            # Stop recording
-                            stop_pipe_recording(stdscr)
-                    elif key == ord('a'):  # Toggle audio
-                        if USE_PIPE:
-                            show_popup_msg(stdscr,"Disable PIPE export first!",error=True)
-                        else:
-                            if audio_available:
-                                audio_enabled = not audio_enabled
-                                if audio_enabled and stream is None:
-                                    try:
-                                        stream = sd.OutputStream(
-                                            channels=2,
-                                            samplerate=DEFAULT_SAMPLE_RATE,
-                                            callback=audio_callback,
-                                            blocksize=DEFAULT_BLOCK_SIZE,
-                                            latency=0.1,
-                                            dtype=np.float32
-                                        )
-                                        stream.start()
-                                    except sd.PortAudioError as e:
-                                        stdscr.addstr(0, 0, f"Audio error: {str(e)}", 
-                                                    curses.color_pair(3) | curses.A_BOLD)
-                                        stdscr.refresh()
-                                        time.sleep(2)
-                                        audio_enabled = False
-                                        stream = None
-                                elif not audio_enabled and stream is not None:
-                                    try:
-                                        stream.stop()
-                                        stream.close()
-                                    except:
-                                        pass
-                                    stream = None
-                                    audio_buffer.clear()
-                    elif key == curses.KEY_UP:  # Increase frequency by 1 MHz
-                        sdr.set_center_freq(sdr.center_freq + 1e6)
-                    elif key == curses.KEY_DOWN:  # Decrease frequency by 1 MHz
-                        sdr.set_center_freq(max(0, sdr.center_freq - 1e6))
-                    elif key == curses.KEY_RIGHT:  # Increase frequency by 0.5 MHz
-                        sdr.set_center_freq(sdr.center_freq + 0.5e6)
-                        ui_update_counter = 0
-                    elif key == curses.KEY_LEFT:  # Decrease frequency by 0.5 MHz
-                        sdr.set_center_freq(max(0, sdr.center_freq - 0.5e6))
-                        ui_update_counter = 0
                     elif key == ord('v'):
                         CURRENT_MODE = 'MR'
                         draw_mr_mode(stdscr,sdr)
                         continue
-                    elif key == ord('x'):  # Set Frequency
-                        ui_update_counter = 0
-                        freq = setfreq(stdscr)
-                        if freq:
-                            if freq[-1] in 'mM  ':
-                                freq = float(freq[:-1]) * 1e6
-                            elif freq[-1] in 'kK':
-                                freq = float(freq[:-1]) * 1e3
-                            sdr.set_center_freq(int(freq))
-                    elif key == ord('t'):  # Decrease step
-                        freq_step = max(0.01e6, freq_step - 0.01e6)
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('T'):  # Increase step
-                        freq_step = min(sdr.sample_rate / 2, freq_step + 0.01e6)
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('h'):  # Help
-                        showhelp(stdscr)
-                        stdscr.clear()
-                        stdscr.refresh()
-                    elif key == ord('b'):  # Zoom in (reduce bandwidth)
-                        bandwidth = max(0.1e6, bandwidth - zoom_step)
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord(']'):
-                        SQUELCH += 1
-                    elif key == ord('['):
-                        SQUELCH -= 1
-                    elif key == ord('B'):  # Zoom out (increase bandwidth)
-                        bandwidth = min(sdr.sample_rate, bandwidth + zoom_step)
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('f'):  # Shift center frequency down
-                        sdr.set_center_freq(max(0, sdr.center_freq - freq_step))
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('F'):  # Shift center frequency up
-                        sdr.set_center_freq(sdr.center_freq + freq_step)
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('s'):  # Decrease samples
-                        SAMPLES -= 1
-                        if SAMPLES < 5:
-                            SAMPLES = 5
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('S'):  # Increase samples
-                        SAMPLES += 1
-                        if SAMPLES > 12:
-                            SAMPLES = 12
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('G'):
-                        gainindex +=1
-                        if gainindex <= len(sdr.valid_gains_db)-1:
-                            sdr.set_gain(sdr.valid_gains_db[gainindex])
-                        else:
-                            sdr.set_gain("auto")
-                            gainindex = -1
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('g'):
-                        gainindex -= 1
-                        if gainindex < 0:
-                            sdr.set_gain(sdr.valid_gains_db[0])
-                            gainindex = 0
-                        else:
-                            sdr.set_gain(sdr.valid_gains_db[gainindex])
-                        ui.draw_clearheader(stdscr)
-                    elif key == ord('k'):  # Save bookmark
-                        add_bookmark(stdscr, sdr.center_freq, bandwidth)
-                    elif key == ord('l'):  # Load bookmark
-                        bkm = show_bookmarks(stdscr)
-                        if bkm is not None:
-                            new_freq = bkm[0]
-                            sdr.set_center_freq(new_freq)
-                            bandwidth = bkm[2]
-                            CURRENT_DEMOD = bkm[1]
-                    elif key == ord('R'):  # Start/Stop recording
-                        ui.draw_clearheader(stdscr)
-                        if not audio_recording and AUDIO_AVAILABLE and audio_enabled:
-                            # Start recording
-                            timestamp = time.strftime("%Y%m%d-%H%M%S")
-                            filename = f"sdr_recording_{timestamp}.wav"
-                            wav_file = start_audio_recording(filename)
-                            audio_recording = True
-                            recording_start_time = time.time()
-                            stdscr.addstr(max_height-1, 0, f"Started recording to {filename}", 
-                                        curses.color_pair(4))
-                        elif audio_recording:
-                            # Stop recording
-                            stop_audio_recording(wav_file)
-                            audio_recording = False
-                            wav_file = None
-                            stdscr.addstr(max_height-1, 0, "Recording stopped", 
-                                        curses.color_pair(4))
-                        else:
-                            stdscr.addstr(max_height-1, 0, 
-                                          "Audio must be enabled to record (press 'a' first)", 
-                                          curses.color_pair(3))
-                        stdscr.refresh()
-                    elif key == ord('w'):  # Save settings
-                        save_settings(sdr, bandwidth, freq_step, SAMPLES, AGC_ENABLED)
-                        stdscr.addstr(max_height-1, 0, "Settings saved", curses.color_pair(4))
-                        stdscr.refresh()
-                        time.sleep(1)  # Show message briefly
-                    elif key == ord('v'):  # Toggle waterfall mode
-                        WATERFALL_MODE = not WATERFALL_MODE
-                        WATERFALL_HISTORY.clear()  # Clear history when switching modes
-                        stdscr.clear()
-                    elif key == ord('r'):  # Load settings
-                        settings = load_settings()
-                        sdr.set_sample_rate(settings['sample_rate'])
-                        sdr.set_center_freq(settings['frequency'])
-                        sdr.set_gain(settings['gain'])
-                        bandwidth = settings['bandwidth']
-                        freq_step = settings['freq_step']
-                        SAMPLES = settings['samples']
-                        AGC_ENABLED = settings['agc_enabled']
-                        stdscr.addstr(max_height-1, 0, "Settings loaded", curses.color_pair(4))
-                        stdscr.refresh()
-                        time.sleep(1)  # Show message briefly
-                    elif key == ord('A'):  # Toggle AGC
-                        ui.draw_clearheader(stdscr)
-                        AGC_ENABLED = not AGC_ENABLED
-                        if not AGC_ENABLED:
-                            # Reset to manual gain mode
-                            if gainindex >= 0 and gainindex < len(sdr.valid_gains_db):
-                                sdr.set_gain(sdr.valid_gains_db[gainindex])
-                            else:
-                                sdr.set_gain('auto')
-                                gainindex = -1
-                    elif key == ord('n'):  # Band presets
-                        new_freq, new_bandwidth = show_band_presets(stdscr)
-                        stdscr.clear()
-                        if new_freq is not None:
-                            sdr.set_center_freq(new_freq)
-                            bandwidth = new_bandwidth
-                            # Adjust gain for the new frequency range
-                            if AGC_ENABLED:
-                                # Force an immediate AGC update
-                                last_agc_update = 0
-                            show_popup_msg(stdscr,f"Switched to band: {new_freq/1e6:.3f} MHz")
-                    elif key == ord('c'):  # Start frequency scanner
-                        # Get scanner configuration
-                        start_freq, end_freq, threshold = show_scanner_menu(stdscr)
-                        if start_freq is not None:
-                            SCAN_ACTIVE = True
-                            signals = []
-                            current_freq = start_freq
-
-                            # Scanning loop
-                            while current_freq <= end_freq and SCAN_ACTIVE:
-                                # Update progress display
-                                draw_scanning_status(stdscr, current_freq, start_freq, end_freq, sdr)
-
-                                # Check for cancel
-                                if stdscr.getch() == ord('q'):
-                                    SCAN_ACTIVE = False
-                                    break
-
-                                # Perform scan for current chunk
-                                try:
-                                    # Set frequency and allow settling time
-                                    sdr.set_center_freq(current_freq)
-                                    time.sleep(0.01)  # Short settling time
-
-                                    # Read samples and compute FFT
-                                    samples = sdr.read_samples(2048)  # Reduced sample size for speed
-                                    if len(samples) > 0:
-                                        # Compute power spectrum
-                                        spectrum = np.fft.fftshift(np.fft.fft(samples))
-                                        power_db = 10 * np.log10(np.abs(spectrum)**2 + 1e-10)
-
-                                        # Find peak power
-                                        peak_power = np.max(power_db)
-
-                                        # If signal detected
-                                        if peak_power > threshold:
-                                            # Estimate bandwidth
-                                            mask = power_db > (peak_power - 20)  # Points within 20dB of peak
-                                            bandwidth = np.sum(mask) * (sdr.sample_rate / len(power_db))
-
-                                            # Only add if bandwidth is reasonable
-                                            if bandwidth > MIN_SIGNAL_BANDWIDTH:
-                                                signals.append({
-                                                    'frequency': current_freq,
-                                                    'power': peak_power,
-                                                    'bandwidth': bandwidth,
-                                                    'type': classify_signal(samples, sdr.sample_rate, bandwidth)
-                                                })
-
-                                                # Debug output
-                                                stdscr.addstr(max_height-1, 0, 
-                                                            f"Signal found: {current_freq/1e6:.3f} MHz, "
-                                                            f"Power: {peak_power:.1f} dB, "
-                                                            f"BW: {bandwidth/1e3:.1f} kHz", 
-                                                            curses.color_pair(4))
-                                                stdscr.refresh()
-
-                                except Exception as e:
-                                    stdscr.addstr(max_height-1, 0, 
-                                                f"Scan error ({type(e).__name__}): {str(e)}", 
-                                                curses.color_pair(3))
-                                    stdscr.refresh()
-
-                                # Move to next frequency
-                                current_freq += SCAN_STEP
-
-                            # After scanning, store results globally
-                            if signals:
-                                global LAST_SCAN_RESULTS
-                                LAST_SCAN_RESULTS = signals.copy()  # Store a copy of the results
-
-                                # Display results and get selected frequency
-                                new_freq = display_scan_results(stdscr, signals, threshold)
-
-                            # Reset scan state
-                            SCAN_ACTIVE = False
-                            stdscr.clear()
-                    elif key == ord('d'):  # Change demodulation mode
-                        new_mode = show_demod_menu(stdscr)
-                        if new_mode is not None:
-                            CURRENT_DEMOD = new_mode
-                            # Update bandwidth based on mode
-                            if DEMOD_MODES[CURRENT_DEMOD]['bandwidth']:
-                                bandwidth = DEMOD_MODES[CURRENT_DEMOD]['bandwidth']
-                            stdscr.addstr(max_height-1, 0, 
-                                        f"Switched to {DEMOD_MODES[CURRENT_DEMOD]['name']} mode", 
-                                        curses.color_pair(4))
-                            stdscr.refresh()
-                            time.sleep(1)
-                    elif key == ord('M'):  # Add Morse decoder option
-                        show_morse_decoder(stdscr, sdr, sdr.sample_rate)
-                        stdscr.clear()
-                        stdscr.refresh()
-                    elif key == ord('.'):  # Add APRS decoder option
-                        show_aprs_decoder(stdscr, sdr, sdr.sample_rate)
-                        stdscr.clear()
-                        stdscr.refresh()
-                    elif key == ord('m'):  # Mode switch
-                        current_mode_index = DISPLAY_MODES.index(current_display_mode)
-                        current_display_mode = DISPLAY_MODES[(current_mode_index + 1) % len(DISPLAY_MODES)]
-                        stdscr.clear()
-                    elif key == ord('/'):  # RTL Commands
-                        show_rtl_commands(stdscr, sdr)  # Pass sdr here
-                    elif key == ord('1'):  # Spectrum Mode switch
-                        current_mode_index = 0
-                        current_display_mode = DISPLAY_MODES[0]
-                        stdscr.clear()
-                    elif key == ord('2'):  # Waterfall Mode switch
-                        current_mode_index = 1
-                        current_display_mode = DISPLAY_MODES[1]
-                        stdscr.clear()
-                    elif key == ord('3'):  # Persistence Mode switch
-                        current_mode_index = 2
-                        current_display_mode = DISPLAY_MODES[2]
-                        stdscr.clear()
-                    elif key == ord('4'):  # Surface Mode switch
-                        current_mode_index = 3
-                        current_display_mode = DISPLAY_MODES[3]
-                        stdscr.clear()
-                    elif key == ord('5'):  # Gradient Mode switch
-                        current_mode_index = 4
-                        current_display_mode = DISPLAY_MODES[4]
-                        stdscr.clear()
-                    elif key == ord('6'):  # Vector Mode switch
-                        current_mode_index = 5
-                        current_display_mode = DISPLAY_MODES[5]
-                        stdscr.clear()
-                    elif key == ord('P'):  # Increase PPM
-                        ui.draw_clearheader(stdscr)
-                        if sdr.ppm < 1000:  # Add reasonable limit
-                            if sdr.set_ppm(sdr.ppm + 1):
-                                show_popup_msg(stdscr, f"PPM set to {sdr.ppm}")
-                            else:
-                                show_popup_msg(stdscr, "Failed to set PPM", error=True)
-                    elif key == ord('p'):  # Decrease PPM
-                        ui.draw_clearheader(stdscr)
-                        if sdr.ppm > -1000:  # Add reasonable limit
-                            if sdr.set_ppm(sdr.ppm - 1):
-                                show_popup_msg(stdscr, f"PPM set to {sdr.ppm}")
-                            else:
-                                show_popup_msg(stdscr, "Failed to set PPM", error=True)
-                    elif key == ord('O'):  # Set exact PPM value
-                        ui.draw_clearheader(stdscr)
-                        stdscr.addstr(0, 0, "Enter PPM correction value: ", 
-                                     curses.color_pair(1) | curses.A_BOLD)
-                        curses.echo()
-                        curses.curs_set(1)
-                        stdscr.nodelay(False)
-                        try:
-                            ppm = int(stdscr.getstr().decode('utf-8'))
-                            if sdr.set_ppm(ppm):
-                                show_popup_msg(stdscr, f"PPM set to {sdr.ppm}")
-                            else:
-                                show_popup_msg(stdscr, "Failed to set PPM", error=True)
-                        except ValueError:
-                            show_popup_msg(stdscr, "Invalid PPM value!", error=True)
-                        finally:
-                            curses.noecho()
-                            curses.curs_set(0)
-                            stdscr.nodelay(True)
-                    # Add new key handler for showing last results
-                    elif key == ord('C'):  # Show last scan results
-                        if LAST_SCAN_RESULTS:
-                            stdscr.nodelay(False)
-                            curses.flushinp()
-
-                            # Display the stored results
-                            new_freq = display_scan_results(stdscr, LAST_SCAN_RESULTS, SIGNAL_THRESHOLD)
-
-                            # If frequency was selected, tune to it
-                            if new_freq is not None:
-                                sdr.set_center_freq(new_freq)
-
-                            stdscr.nodelay(True)
-                            stdscr.clear()
-                        else:
-                            # Show message if no previous scan results exist
-                            ui.draw_clearheader(stdscr)
-                            stdscr.addstr(0, 0, "No previous scan results available", curses.color_pair(3))
-                            stdscr.refresh()
-                            time.sleep(2)
-                            ui.draw_clearheader(stdscr)
+                    else:
+                        handler = key_handlers.get(key)
+                        if handler:
+                            handler()
+                            # Handlers only post their screen changes, send them in one update
+                            curses.doupdate()
                 else: # in MR mode
                     if key == curses.KEY_UP and mr_selected_index > 0:
                         mr_selected_index -= 1
@@ -2756,7 +3069,7 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
                         draw_mr_mode(stdscr,sdr)
                     elif key == ord('s'):  # Capital S for search
                         curses.echo()
-                        stdscr.addstr(max_height - 2, 2, "Filter: ", curses.color_pair(4))
+                        stdscr.addstr(max_height - 2, 2, "Filter: ", CP_OK)
                         stdscr.clrtoeol()
                         stdscr.nodelay(False)
                         query = stdscr.getstr(max_height - 2, 10, 30).decode('utf-8').strip()
@@ -2770,16 +3083,12 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
                 # Remove the separate recording duration display since it's now handled in draw_spectrogram
                 if audio_recording and AUDIO_AVAILABLE and audio_enabled:
                     if len(audio_buffer) > 0:
-                        audio_data = np.concatenate(list(audio_buffer))
-                        write_audio_samples(wav_file, audio_data)
-                        audio_buffer.clear()
+                        write_audio_samples(wav_file, audio_buffer.drain())
                 if USE_PIPE:
                   if len(audio_buffer) > 0:
                         try:
-                            audio_data = np.concatenate(list(audio_buffer))
-                            write_to_pipe(PIPE_FILE,audio_data,stdscr)
+                            write_to_pipe(PIPE_FILE,audio_buffer.drain(),stdscr)
                             # write_to_pipe(PIPE_FILE,data[:frames].tobytes()) 
-                            audio_buffer.clear()
                             stdscr.addstr(".")
                         except BlockingIOError as e:
                             if e.errno == errno.EAGAIN:
@@ -2809,6 +3118,7 @@ def main(stdscr, startup_freq=None, video_mode="SPECTRUM", device=None):
     except KeyboardInterrupt:
         pass
     finally:
+        sample_reader.shutdown(wait=True)
         sdr.close()
         if stream:
             stream.stop()
@@ -1,16 +1,28 @@
 import numpy as np
-from scipy.signal import butter, lfilter
-from scipy.signal import firwin
-from scipy.signal import hilbert
-from scipy.signal import decimate
-from scipy.signal import bilinear
-from scipy.signal import resample_poly
+from scipy.fft import fft, fftfreq, fftshift, next_fast_len
+# scipy.signal takes about half a second to import and is only needed once audio or
+# the scanner runs, so the functions below import what they use from it locally
 
 from pyspecconst import DEFAULT_SAMPLE_RATE, BUTTER_ORDER
 
+# Optional FFTW backend for the spectrum and the scanner, whose FFTs keep the same size
+# from frame to frame and so reuse one cached plan
+PYFFTW_AVAILABLE = False
+try:
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    PYFFTW_AVAILABLE = True
+except ImportError:
+    pass
+
+planned_fft = pyfftw.interfaces.scipy_fft.fft if PYFFTW_AVAILABLE else fft
+
 
 # Filter to cut freq below/higher than 300/3000hz
 def butter_bandpass(lowcut, highcut, fs, order=5):
+    from scipy.signal import butter
     nyq = 0.5 * fs
     low = lowcut / nyq
     high = highcut / nyq
@@ -19,13 +31,22 @@ def butter_bandpass(lowcut, highcut, fs, order=5):
 
 
 def butter_lowpass(cutoff, fs, order=5):
+    from scipy.signal import butter
     nyq = 0.5 * fs
     normal_cutoff = cutoff / nyq
     b, a = butter(order, normal_cutoff, btype='low', analog=False)
     return b, a
 
 
+# Filter coefficients only depend on the settings, so they are designed once per setting
+_FIR_CACHE = {}
+_SOS_CACHE = {}
+_DEEMPHASIS_CACHE = {}
+_WELCH_CACHE = {}
+
+
 def lowpass_filter(data, cutoff=3000, fs=DEFAULT_SAMPLE_RATE, order=5):
+    from scipy.signal import lfilter
     b, a = butter_lowpass(cutoff, fs, order=order)
     y = lfilter(b, a, data)
     return y
@@ -34,14 +55,38 @@ def lowpass_filter(data, cutoff=3000, fs=DEFAULT_SAMPLE_RATE, order=5):
 def bandpass_filter(data, lowcut, highcut, sample_rate):
     """Apply a bandpass filter to the data."""
     from scipy.signal import butter, sosfilt
-    if lowcut <= 0:
-        # Use a lowpass filter if lowcut is not valid
-        sos = butter(BUTTER_ORDER, highcut / (sample_rate / 2), btype='low', output='sos')
-    else:
-        sos = butter(BUTTER_ORDER, [lowcut / (sample_rate / 2), highcut / (sample_rate / 2)], btype='band', output='sos')
+    key = (lowcut, highcut, sample_rate)
+    sos = _SOS_CACHE.get(key)
+    if sos is None:
+        if lowcut <= 0:
+            # Use a lowpass filter if lowcut is not valid
+            sos = butter(BUTTER_ORDER, highcut / (sample_rate / 2), btype='low', output='sos')
+        else:
+            sos = butter(BUTTER_ORDER, [lowcut / (sample_rate / 2), highcut / (sample_rate / 2)], btype='band', output='sos')
+        _SOS_CACHE[key] = sos
     return sosfilt(sos, data)
 
 
+def _get_taps(numtaps, cutoff):
+    """Lowpass FIR taps as float32, cutoff normalized to Nyquist as in firwin"""
+    from scipy.signal import firwin
+    key = (numtaps, cutoff)
+    taps = _FIR_CACHE.get(key)
+    if taps is None:
+        taps = _FIR_CACHE[key] = firwin(numtaps, cutoff, window='hamming').astype(np.float32)
+    return taps
+
+
+def _get_deemphasis(sample_rate, tc=75e-6):
+    """(b, a) of the single-pole de-emphasis filter for time constant tc"""
+    key = (sample_rate, tc)
+    coeffs = _DEEMPHASIS_CACHE.get(key)
+    if coeffs is None:
+        alpha = np.exp(-1 / (tc * sample_rate))
+        coeffs = _DEEMPHASIS_CACHE[key] = ([1 - alpha], [1, -alpha])
+    return coeffs
+
+
 # Run this function before using the rtl-sdr samples to remove dc offset and correct iq
 def iq_correction(samples: np.ndarray) -> np.ndarray:
     # Remove DC and calculate input power
@@ -82,16 +127,41 @@ def iq_correction(samples: np.ndarray) -> np.ndarray:
 
 def mono_to_stereo(mono_audio):
     """Convert mono audio to stereo by duplicating the mono signal."""
-    stereo_audio = np.zeros((len(mono_audio), 2))  # Initialize stereo array
+    stereo_audio = np.zeros((len(mono_audio), 2), dtype=np.float32)  # Initialize stereo array
     stereo_audio[:, 0] = mono_audio  # Left channel
     stereo_audio[:, 1] = mono_audio  # Right channel (duplicate)
     return stereo_audio
     
 
+# Scratch buffers reused by fm_discriminate, resized when the sample count or dtype changes
+_FM_PRODUCT_BUF = np.empty(0, dtype=np.complex64)
+_FM_PHASE_BUF = np.empty(0, dtype=np.float32)
+
+
+def fm_discriminate(samples):
+    """FM discriminator, the phase step angle(s[n] * conj(s[n-1])) in radians
+
+    Works in preallocated buffers instead of allocating the conjugate and the
+    product on every block. The returned array is reused on the next call,
+    copy it if it must be kept.
+    """
+    global _FM_PRODUCT_BUF, _FM_PHASE_BUF
+    n = len(samples) - 1
+    if len(_FM_PRODUCT_BUF) != n or _FM_PRODUCT_BUF.dtype != samples.dtype:
+        _FM_PRODUCT_BUF = np.empty(n, dtype=samples.dtype)
+        _FM_PHASE_BUF = np.empty(n, dtype=samples.real.dtype)
+
+    product = _FM_PRODUCT_BUF
+    np.conjugate(samples[:-1], out=product)
+    product *= samples[1:]
+    return np.arctan2(product.imag, product.real, out=_FM_PHASE_BUF)
+
+
 def demodulate_nfm(samples, sample_rate, target_rate=DEFAULT_SAMPLE_RATE):
     """Simplified FM demodulation"""
+    from scipy.signal import resample_poly
     # Basic FM demodulation
-    demod = np.angle(samples[1:] * np.conj(samples[:-1]))
+    demod = fm_discriminate(samples)
 
     # Simple scaling
     demod = demod * (sample_rate / (2 * np.pi))
@@ -101,15 +171,9 @@ def demodulate_nfm(samples, sample_rate, target_rate=DEFAULT_SAMPLE_RATE):
     # highcut = 3000.0  # High cutoff frequency
     # filtered_demod = bandpass_filter(demod, lowcut, highcut, sample_rate)
 
-    # Basic lowpass filter
-    nyq = sample_rate / 2
-    cutoff = 15000
-    taps = firwin(numtaps=65, cutoff=cutoff/nyq)
-    filtered = lfilter(taps, 1.0, demod)
-
-    # Simple decimation
+    # Lowpass and decimate in one polyphase pass, only the kept samples are filtered
     decimation_factor = int(sample_rate / target_rate)
-    audio = decimate(filtered, decimation_factor)
+    audio = resample_poly(demod, 1, decimation_factor)
 
     # Basic normalization
     audio = audio / np.max(np.abs(audio)) * 0.95
@@ -118,8 +182,9 @@ def demodulate_nfm(samples, sample_rate, target_rate=DEFAULT_SAMPLE_RATE):
 
 def demodulate_wfm(samples, sample_rate, target_rate=DEFAULT_SAMPLE_RATE):
     """Wide FM demodulation with stereo decoding."""
+    from scipy.signal import lfilter, resample_poly
     # Step 1: FM demodulation
-    demod = np.angle(samples[1:] * np.conj(samples[:-1]))
+    demod = fm_discriminate(samples)
 
     # Step 2: Extract the baseband (L+R), pilot, and stereo difference (L-R) signals
     # Lowpass filter for L+R (0-15 kHz)
@@ -141,18 +206,15 @@ def demodulate_wfm(samples, sample_rate, target_rate=DEFAULT_SAMPLE_RATE):
     right = (l_plus_r - l_minus_r) / 2
 
     # Step 4: De-emphasis filter (75 µs time constant)
-    deemph_tc = 75e-6  # 75 µs (FM standard)
-    alpha = np.exp(-1 / (deemph_tc * sample_rate))
-    b = [1 - alpha]
-    a = [1, -alpha]
+    b, a = _get_deemphasis(sample_rate, 75e-6)  # 75 µs (FM standard)
     left = lfilter(b, a, left)
     right = lfilter(b, a, right)
 
     # Step 5: Decimate to target sample rate
     decimation_factor = int(sample_rate / target_rate)
     if decimation_factor > 1:
-        left = decimate(left, decimation_factor, zero_phase=True)
-        right = decimate(right, decimation_factor, zero_phase=True)
+        left = resample_poly(left, 1, decimation_factor)
+        right = resample_poly(right, 1, decimation_factor)
 
     # Step 6: Normalize the audio
     max_val = max(np.max(np.abs(left)), np.max(np.abs(right)))
@@ -197,20 +259,13 @@ def demodulate_am(samples):
 
 def demodulate_ssb(samples, sample_rate, lower=True):
     """Single-sideband demodulation"""
-    # Complex bandpass filter
-    if lower:
-        # LSB: negative frequencies only
-        taps = firwin(65, 3000/sample_rate, window='hamming')
-        analytical = lfilter(taps, 1.0, samples)
-        analytical = hilbert(np.real(analytical))
-    else:
-        # USB: positive frequencies only
-        taps = firwin(65, 3000/sample_rate, window='hamming')
-        analytical = lfilter(taps, 1.0, samples)
-        analytical = hilbert(np.real(analytical))
-
-    # Demodulate
-    demod = np.real(analytical)
+    from scipy.signal import lfilter
+    # Lowpass filter. The taps are real, so filtering only the I component gives
+    # the same real part as filtering the complex samples. The real part of an
+    # analytic signal is its input, so no Hilbert transform is needed either.
+    # Both sidebands share this path for now
+    taps = _get_taps(65, 3000/sample_rate)
+    demod = lfilter(taps, np.float32(1.0), samples.real)
 
     # Normalize
     audio = demod / np.max(np.abs(demod)) * 0.95 
@@ -240,17 +295,34 @@ def demodulate_signal(samples, sample_rate, mode='NFM'):
     return np.zeros((len(samples), 2))  # Ensure it returns a shape of (n, 2)
 
 
+# Scratch buffers reused by compute_fft, resized when the sample count changes
+_FFT_WINDOW = np.empty(0)
+_WINDOWED_BUF = np.empty(0, dtype=np.complex64)
+_POWER_DB_BUF = np.empty(0)
+
+
 def compute_fft(samples):
-    """Compute normalized FFT with proper scaling"""
+    """Compute normalized FFT with proper scaling
+
+    The returned array is reused on the next call, copy it if it must be kept.
+    """
+    global _FFT_WINDOW, _WINDOWED_BUF, _POWER_DB_BUF
+    n = len(samples)
+    if len(_FFT_WINDOW) != n:
+        _FFT_WINDOW = np.hamming(n).astype(np.float32)  # Keeps complex64 samples single precision
+        _WINDOWED_BUF = np.empty(n, dtype=np.complex64)
+        _POWER_DB_BUF = np.empty(n, dtype=np.float32)
+
     # Apply window function to reduce spectral leakage
-    window = np.hamming(len(samples))
-    windowed_samples = samples * window
+    windowed_samples = np.multiply(samples, _FFT_WINDOW, out=_WINDOWED_BUF)
 
-    # Compute FFT and shift zero frequency to center
-    fft = np.fft.fftshift(np.fft.fft(windowed_samples))
+    # Compute FFT (scipy.fft runs single-threaded by default, which is fastest for
+    # one 1-D transform of this size). The windowed scratch buffer may be used as
+    # FFT workspace. Zero frequency is shifted to the center further down.
+    spectrum = planned_fft(windowed_samples, overwrite_x=True)
 
     # Convert to power spectrum in dB, with proper scaling
-    #power_db = 20 * np.log10(np.abs(fft) + 1e-10)
+    #power_db = 20 * np.log10(np.abs(spectrum) + 1e-10)
 
     # Apply calibration factors
     #system_gain = -30  # Adjustment for system gain
@@ -258,45 +330,212 @@ def compute_fft(samples):
 
     # Apply calibration and clip to reasonable range
     #power_db = np.clip(power_db + system_gain + ref_level, -100, -20)
-    
-    power_db = 10 * np.log10(np.abs(fft)**2 + 1e-10)
+
+    # |X|^2 as re^2 + im^2 squared in the FFT output itself, then log10 in place,
+    # all in float32 and without abs/** temporaries. The fftshift happens while
+    # copying the power into the output buffer, instead of on the complex spectrum
+    power = _power_in_place(spectrum)
+    half = n // 2
+    power_db = _POWER_DB_BUF
+    power_db[:half] = power[n - half:]
+    power_db[half:] = power[:n - half]
+    power_db += 1e-10
+    np.log10(power_db, out=power_db)
+    power_db *= 10
 
     return power_db
 
 
+def _power_in_place(spectrum):
+    """|X|^2 of an FFT output that is no longer needed, without temporaries
+
+    Squares the real and imaginary parts in place and returns the real part
+    view, which then holds re^2 + im^2.
+    """
+    re, im = spectrum.real, spectrum.imag
+    np.square(re, out=re)
+    np.square(im, out=im)
+    re += im
+    return re
+
+
+def partition_percentile(data, q):
+    """np.percentile(data, q) for 1D data and the default linear method, via np.partition
+
+    Selects only the two neighbouring order statistics and interpolates between
+    them the way numpy does, skipping np.percentile's generic wrapper overhead.
+    """
+    n = len(data)
+    virtual_index = (n - 1) * (q / 100)
+    lo = int(virtual_index)
+    hi = min(lo + 1, n - 1)
+    gamma = virtual_index - lo
+    part = np.partition(data, [lo, hi])
+    below, above = part[lo], part[hi]
+    diff = above - below
+    # numpy interpolates from the nearer side to keep the result within [below, above]
+    if gamma >= 0.5:
+        return above - diff * (1 - gamma)
+    return below + diff * gamma
+
+
+class SpectrumHistory:
+    """Last max_lines spectrum lines kept in one preallocated ring buffer
+
+    The (min, max) of the finite values of every line is recorded when it is
+    added, so the range of the whole history never needs a full pass.
+    """
+
+    def __init__(self, max_lines):
+        self.max_lines = max_lines
+        self.buf = np.empty((max_lines, 0))
+        self.ranges = np.empty((max_lines, 2))
+        self.head = 0  # Row the next line is written to
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, line):
+        """Add a line, evicting the oldest one when full; a change of line size or dtype restarts the history"""
+        if self.buf.shape[1] != len(line) or self.buf.dtype != line.dtype:
+            self.buf = np.empty((self.max_lines, len(line)), dtype=line.dtype)
+            self.ranges = np.empty((self.max_lines, 2), dtype=line.dtype)
+            self.head = 0
+            self.count = 0
+
+        finite_line = line[np.isfinite(line)]
+        self.buf[self.head] = line
+        self.ranges[self.head] = (finite_line.min(), finite_line.max()) if len(finite_line) else (np.inf, -np.inf)
+        self.head = (self.head + 1) % self.max_lines
+        self.count = min(self.count + 1, self.max_lines)
+
+    def lines(self):
+        """All lines as a new array, oldest first"""
+        return self.buf[(self.head - self.count + np.arange(self.count)) % self.max_lines]
+
+    def latest(self, n):
+        """The last n lines as a new array, newest first"""
+        return self.buf[(self.head - 1 - np.arange(min(n, self.count))) % self.max_lines]
+
+    def value_range(self):
+        """(min, max) of the finite values of all lines"""
+        ranges = self.ranges[:self.count]
+        return ranges[:, 0].min(), ranges[:, 1].max()
+
+
+def analyze_chunk(samples, sample_rate, threshold):
+    """Measure one scanner chunk, returns (peak_power, bandwidth, detected)
+
+    The bandwidth counts the bins above the threshold and is only computed
+    on detections. The threshold is compared in the linear power domain,
+    which gives the same result as comparing in dB.
+    """
+    # Compute power spectrum, kept linear: only the peak needs converting to dB.
+    # Max and count do not depend on bin order, so the spectrum is not shifted,
+    # and odd lengths are zero-padded to a size pocketfft handles fastest
+    spectrum = planned_fft(samples, n=next_fast_len(len(samples)))
+    power = _power_in_place(spectrum)
+    peak_power = 10 * np.log10(np.max(power) + 1e-10)
+
+    if peak_power <= threshold:
+        return peak_power, 0.0, False
+
+    bandwidth = np.count_nonzero(power > 10 ** (threshold / 10) - 1e-10) * (sample_rate / len(power))
+    return peak_power, bandwidth, True
+
+
+def find_chunk_signals(samples, sample_rate, threshold, min_bandwidth, span, bandwidth_db=20):
+    """Find all signals in one scanner chunk
+
+    Returns (offsets, powers, bandwidths) arrays for the peaks above threshold.
+    Offsets are the band centers in Hz from the tuned frequency, limited to
+    +/- span/2 so that overlapping chunks do not report a signal twice. Peaks
+    closer than min_bandwidth are merged and each bandwidth is measured
+    bandwidth_db below its peak.
+    """
+    from scipy.signal import find_peaks, peak_widths
+    # Compute power spectrum, smoothed so that noise-like signals have a flat top
+    spectrum = fftshift(planned_fft(samples))
+    power = np.convolve(_power_in_place(spectrum), np.full(9, 1 / 9, dtype=np.float32), mode='same')
+    power_db = 10 * np.log10(power + 1e-10)
+    bin_hz = sample_rate / len(power_db)
+
+    peaks, props = find_peaks(power_db, height=threshold, prominence=bandwidth_db / 2,
+                              distance=max(1, int(min_bandwidth / bin_hz)))
+
+    # Width at bandwidth_db below the peak, or at its base for weaker peaks
+    prominence_data = (np.minimum(props['prominences'], bandwidth_db),
+                       props['left_bases'], props['right_bases'])
+    widths, _, left, right = peak_widths(power_db, peaks, rel_height=1.0, prominence_data=prominence_data)
+
+    offsets = ((left + right) / 2 - len(power_db) // 2) * bin_hz
+    keep = np.abs(offsets) <= span / 2
+    return offsets[keep], props['peak_heights'][keep], widths[keep] * bin_hz
+
+
 def estimate_bandwidth(psd, freqs, threshold_db=-20):
     """Estimate signal bandwidth using power spectral density"""
     # Convert to dB
     psd_db = 10 * np.log10(psd + 1e-10)
     max_power = np.max(psd_db)
 
-    # Find frequencies above threshold
+    # Find the first and last bins above threshold
     mask = psd_db > (max_power + threshold_db)
-    if not np.any(mask):
+    first = np.argmax(mask)
+    if not mask[first]:
         return 0
+    last = len(mask) - 1 - np.argmax(mask[::-1])
 
     # Calculate bandwidth
-    freq_range = freqs[mask]
-    return freq_range[-1] - freq_range[0]
+    return freqs[last] - freqs[first]
 
 
 def estimate_modulation_index(samples):
     """Estimate modulation index using amplitude variation"""
     # Use magnitude of complex samples instead of Hilbert transform
     amplitude_env = np.abs(samples)
-    phase_env = np.unwrap(np.angle(samples))
 
-    # Calculate variance ratios
+    # Calculate variance ratios, the steps of the unwrapped phase are the
+    # discriminator output, which needs no angle/unwrap/diff temporaries
     amp_var = np.var(amplitude_env)
-    phase_var = np.var(np.diff(phase_env))
+    phase_var = np.var(fm_discriminate(samples))
 
     return phase_var / (amp_var + 1e-10)
 
 
+def welch_psd(samples, sample_rate, nperseg=1024):
+    """Two-sided Welch PSD of complex IQ samples, same result as scipy.signal.welch
+
+    Uses scipy's defaults (hann window, 50% overlap, constant detrend, density
+    scaling) but transforms all segments in one batched FFT on a strided view.
+    The window, scale and frequencies are cached per (nperseg, sample_rate).
+    """
+    if len(samples) < nperseg:
+        from scipy.signal import welch
+        return welch(samples, fs=sample_rate, nperseg=nperseg, return_onesided=False)
+
+    key = (nperseg, sample_rate)
+    cached = _WELCH_CACHE.get(key)
+    if cached is None:
+        from scipy.signal import get_window
+        window = get_window('hann', nperseg)
+        cached = _WELCH_CACHE[key] = (window.astype(np.float32), 1.0 / (sample_rate * np.sum(window ** 2)),
+                                      fftfreq(nperseg, 1 / sample_rate))
+    window, scale, freqs = cached
+
+    segments = np.lib.stride_tricks.sliding_window_view(samples, nperseg)[::nperseg // 2]
+    segments = segments - segments.mean(axis=1, keepdims=True)
+    segments *= window
+    psd = _power_in_place(fft(segments, axis=-1, overwrite_x=True)).mean(axis=0)
+    psd *= float(scale)
+    return freqs, psd
+
+
 def classify_signal(samples, sample_rate, bandwidth):
     """Classify signal type based on spectral characteristics"""
     # Calculate power spectral density
-    freqs, psd = welch(samples, fs=sample_rate, nperseg=1024)
+    freqs, psd = welch_psd(samples, sample_rate)
 
     # Calculate basic signal characteristics
     signal_bw = estimate_bandwidth(psd, freqs)
@@ -324,12 +563,14 @@ def classify_signal(samples, sample_rate, bandwidth):
 
 def measure_signal_power(samples):
     """Calculate average power of signal in dB"""
-    power = np.mean(np.abs(samples)**2)
+    # vdot(s, s) is sum(|s|^2) in a single pass without temporaries
+    power = np.vdot(samples, samples).real / len(samples)
     return 10 * np.log10(power + 1e-10)  # Add small value to prevent log(0)
 
 
 def decode_mono(samples: np.ndarray, fs: int):
     """Decode FM modulation to mono audio."""
+    from scipy.signal import lfilter, decimate, bilinear
     demod_gain = fs / (2 * np.pi * np.pi * 75e3)  # 75e3 is the frequency deviation
 
     # FM Demodulation